@@ -1,37 +1,69 @@
 import numpy as np
-import gym
-import haliteenv
-from haliteenv import Constants
+from haliteenv import BatchedHaliteEnv, HaliteEngine, StatePool, RandomBot, GreedyMinerBot
+from haliteenv.engine import MapType, MapSize
 import time
+import copy
 
-halite = gym.make('HEnv2PTrain-v0')
-mapShape = (halite.metadata['map_size'], halite.metadata['map_size'], halite.metadata['num_players'])
+#Throughput benchmark: env-steps per second of BatchedHaliteEnv for different numbers of games
+NUM_STEPS = 200
+BATCH_SIZES = [1, 4, 16, 64, 256]
+NUM_PLAYERS = 2
+#Maps and actions are drawn from this seed, so runs can be compared with each other
+SEED = 0
+random = np.random.default_rng(SEED)
 
-startTime = time.clock()
-action = np.ones(mapShape)
-mapObs, reward = halite.step(action)
-NUM_STEPS = 5000
-dropoffs = 0
-for i in range(0, NUM_STEPS):
-   action = np.zeros(mapShape, np.int64)
-   for player in range(0, halite.metadata['num_players']):
-      if i % 2 == 0:
-         ships = np.where(mapObs[0][:, :, 3] == 1)
-         for loc in range(0, len(ships[0])):
-            if((mapObs[1][player] + mapObs[0][ships[0][loc], ships[1][loc], 0]) > Constants.DROPOFF_COST and mapObs[0][ships[0][loc], ships[1][loc], 4] == player + 1 and mapObs[0][ships[0][loc], ships[1][loc], 2] == 0 and dropoffs < 4):
-               action[ships[0][loc], ships[1][loc], player] = 2 #Convert to dropoff
-               dropoffs += 1
-            else:
-               action[ships[0][loc], ships[1][loc], player] = np.random.randint(3, 7)#Do random action
-      else:
-         factories = np.where(mapObs[0][:, :, 2] == 1)
-         for loc in range(0, len(factories[0])):   
-            #Spawn ships whenever possible
-            #The environment would just ignore if no ship can be spawned
-            action[factories[0][loc], factories[1][loc], player] = 1
-   mapObs, reward = halite.step(action)
-timeTaken = time.clock() - startTime
-print(str(timeTaken) + " seconds")
-print("Average time per loop: " + str(timeTaken / NUM_STEPS))
-print("Finished! Rendering . . .")
-halite.render()
\ No newline at end of file
+def randomActions(maps, numPlayers, turn):
+   """
+   Random moves for every ship on even turns, spawns on every factory on odd turns
+   (a ship sitting on a factory shares its action with the factory)
+   """
+   if turn % 2 == 0:
+      return random.integers(3, 7, maps.shape[:3] + (numPlayers,))
+   #The environment would just ignore if no ship can be spawned
+   return np.ones(maps.shape[:3] + (numPlayers,), np.int64)
+
+for numEnvs in BATCH_SIZES:
+   halite = BatchedHaliteEnv(numEnvs, NUM_PLAYERS, MapType.BASIC, MapSize.MEDIUM, seed=SEED)
+   mapObs, reward, episodeOver, info = halite.step(np.zeros(halite.maps.shape[:3] + (NUM_PLAYERS,), np.int64))
+   timeTaken = 0
+   for i in range(0, NUM_STEPS):
+      action = randomActions(mapObs[0], NUM_PLAYERS, i)
+      startTime = time.perf_counter()
+      mapObs, reward, episodeOver, info = halite.step(action)
+      timeTaken += time.perf_counter() - startTime
+   ships = int(np.sum(mapObs[0][:, :, :, 3]))
+   print("Games: %4d   env-steps/sec: %10.1f   seconds per step: %.6f   ships at end: %d" % (numEnvs, numEnvs * NUM_STEPS / timeTaken, timeTaken / NUM_STEPS, ships))
+
+#Whole game benchmark: complete games of self-play by the baseline bots, played back to back, resets included
+NUM_GAMES = 16
+for bot in [RandomBot(stayChance=0, seed=SEED), GreedyMinerBot(seed=SEED)]:
+   halite = BatchedHaliteEnv(NUM_GAMES, NUM_PLAYERS, MapType.BASIC, MapSize.MEDIUM, seed=SEED)
+   startTime = time.perf_counter()
+   totalReward, finalHalite = halite.runEpisodes(NUM_GAMES, [bot] * NUM_PLAYERS)
+   timeTaken = time.perf_counter() - startTime
+   print("Whole games (%s): %d games of %d turns in %.2f seconds (%.1f env-steps/sec), mean halite at end %.0f" %
+         (type(bot).__name__, NUM_GAMES, halite.maxTurns, timeTaken, NUM_GAMES * halite.maxTurns / timeTaken, finalHalite.mean()))
+
+#Tree search benchmark: cost per node of forking the state, stepping it and restoring it
+NUM_NODES = 2000
+halite = HaliteEngine(NUM_PLAYERS, MapType.BASIC, MapSize.MEDIUM, seed=SEED)
+for i in range(0, 50):
+   halite.step(randomActions(halite.map[None], NUM_PLAYERS, i)[0])
+pool = StatePool(halite.mapSize, NUM_PLAYERS)
+action = randomActions(halite.map[None], NUM_PLAYERS, 0)[0]
+startTime = time.perf_counter()
+for i in range(0, NUM_NODES):
+   node = halite.getState(pool)
+   halite.step(action)
+   halite.setState(node)
+   pool.release(node)
+timeTaken = time.perf_counter() - startTime
+startTime = time.perf_counter()
+for i in range(0, NUM_NODES):
+   pool.release(halite.getState(pool))
+forkTime = (time.perf_counter() - startTime) / NUM_NODES
+startTime = time.perf_counter()
+for i in range(0, NUM_NODES):
+   copy.deepcopy(halite)
+deepcopyTime = (time.perf_counter() - startTime) / NUM_NODES
+print("Fork + step + restore: %.1f us per node (fork alone %.1f us, deepcopy of the env %.1f us)" % (timeTaken / NUM_NODES * 1e6, forkTime * 1e6, deepcopyTime * 1e6))
@@ -1,23 +1,74 @@
-from gym.envs.registration import register
-from haliteenv.haliteenv import HaliteEnv, Constants
+import sys
+import importlib
+import importlib.util
+from haliteenv.constants import Constants
 
-register(
-   id='HEnv2PTrain-v0',
-   entry_point='haliteenv.haliteenv:HaliteEnv',
-   kwargs={
-      'numPlayers':2,
-      'mapType':haliteenv.MapType.BASIC,
-      'mapSize':haliteenv.MapSize.MEDIUM,
-      'regenMapOnReset':False
-   },
-)
-register(
-   id='HEnv2PTrain-v1',
-   entry_point='haliteenv.haliteenv:HaliteEnv',
-   kwargs={
-      'numPlayers':2,
-      'mapType':haliteenv.MapType.BASIC,
-      'mapSize':haliteenv.MapSize.MEDIUM,
-      'regenMapOnReset':True
-   },
-)
\ No newline at end of file
+#Module each public class/function is in. They are only imported the first time they are used,
+#so e.g. workers only using BatchedHaliteEnv don't load gym, matplotlib or multiprocessing
+EXPORTS = {
+   'HaliteEnv':'haliteenv.haliteenv',
+   'HaliteEngine':'haliteenv.engine',
+   'MapCache':'haliteenv.engine',
+   'spawnSeeds':'haliteenv.engine',
+   'BatchedHaliteEnv':'haliteenv.batched',
+   'CompactState':'haliteenv.state',
+   'DeltaTracker':'haliteenv.delta',
+   'ObservationDelta':'haliteenv.delta',
+   'EnvState':'haliteenv.snapshot',
+   'StatePool':'haliteenv.snapshot',
+   'SubprocVecHaliteEnv':'haliteenv.subproc',
+   'AsyncHaliteEnv':'haliteenv.asyncenv',
+   'ReplayWriter':'haliteenv.replay',
+   'ReplayReader':'haliteenv.replay',
+   'ReplayDataset':'haliteenv.dataset',
+   'StepProfiler':'haliteenv.profiling',
+   'ObservationEncoder':'haliteenv.encoder',
+   'FrameRenderer':'haliteenv.rendering',
+   'RandomBot':'haliteenv.bots',
+   'GreedyMinerBot':'haliteenv.bots',
+   'SpawnerBot':'haliteenv.bots',
+}
+__all__ = ['Constants'] + list(EXPORTS)
+
+def __getattr__(name):
+   """
+   Imports the public class/function <name> from its module on first use.
+   """
+   if(name not in EXPORTS):
+      raise AttributeError("module 'haliteenv' has no attribute " + repr(name))
+   value = getattr(importlib.import_module(EXPORTS[name]), name)
+   globals()[name] = value
+   return value
+
+def __dir__():
+   return sorted(list(globals()) + list(EXPORTS))
+
+class GymRegistrationHook:
+   """
+   Import hook registering the gym ids (see registration) as soon as gym is imported, so
+   gym.make finds them whether haliteenv or gym is imported first, without haliteenv importing
+   gym itself. It wraps the loader of gym's module and removes itself once gym is found.
+   """
+   def find_spec(self, name, path, target = None):
+      if(name != 'gym'):
+         return None
+      sys.meta_path.remove(self)
+      spec = importlib.util.find_spec(name)
+      if(spec is not None and spec.loader is not None):
+         self.loader = spec.loader
+         spec.loader = self
+      return spec
+
+   def create_module(self, spec):
+      return self.loader.create_module(spec)
+
+   def exec_module(self, module):
+      module.__spec__.loader = module.__loader__ = self.loader
+      self.loader.exec_module(module)
+      importlib.import_module('haliteenv.registration')
+
+#With gym already loaded, registering the environments costs nothing
+if('gym' in sys.modules):
+   from haliteenv import registration
+else:
+   sys.meta_path.insert(0, GymRegistrationHook())
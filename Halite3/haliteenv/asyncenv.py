@@ -0,0 +1,161 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+class StepTimings:
+   """
+   Per-phase timing of asynchronous steps, in seconds.
+      submit   - time stepAsync() took to hand the actions out
+      simulate - time the games took to step (the slowest env/worker of each step)
+      overlap  - time between stepAsync() returning and stepWait() being called, i.e. the
+                 caller's own work (like inference on the previous batch) done while the games stepped
+      wait     - time stepWait() was blocked waiting for the games to finish
+
+   Attributes:
+   -----------
+   self.steps : int
+      Number of steps timed
+
+   self.totals : dict
+      Total seconds of each phase
+
+   self.last : dict
+      Seconds of each phase in the last step
+   """
+   PHASES = ('submit', 'simulate', 'overlap', 'wait')
+
+   def __init__(self):
+      self.reset()
+
+   def reset(self):
+      """
+      Clears all timings.
+      """
+      self.steps = 0
+      self.totals = dict.fromkeys(self.PHASES, 0.0)
+      self.last = dict.fromkeys(self.PHASES, 0.0)
+
+   def add(self, phase, seconds):
+      """
+      Adds <seconds> to <phase> of the current step.
+      """
+      self.last[phase] = seconds
+      self.totals[phase] += seconds
+
+   def summary(self):
+      """
+      Average seconds per step of each phase.
+      """
+      return {phase: total / max(self.steps, 1) for phase, total in self.totals.items()}
+
+class AsyncHaliteEnv:
+   """
+   Steps a pool of environments (HaliteEnv, BatchedHaliteEnv or anything else with step/reset)
+   on a thread pool, so the caller can do other work (like policy inference) while they step:
+      env.stepAsync(actions)
+      ...inference on the previous observations...
+      results = env.stepWait()
+   or from a coroutine: results = await env.asyncStep(actions).
+   Threads only overlap where NumPy releases the GIL; for simulation fully in parallel use
+   SubprocVecHaliteEnv, which has the same interface.
+
+   Attributes:
+   -----------
+   self.envs : list
+      Environments of the pool
+
+   self.timings : StepTimings
+      Per-phase timing of every step
+   """
+   def __init__(self, envs, maxWorkers = None):
+      """
+      AsyncHaliteEnv initialization function.
+
+      Parameters:
+      -----------
+      envs : list
+         Environments to step
+      maxWorkers : int
+         Number of threads (one per environment if None)
+      """
+      self.envs = list(envs)
+      self.executor = ThreadPoolExecutor(maxWorkers if maxWorkers is not None else len(self.envs))
+      self.futures = None
+      self.submitted = 0
+      self.timings = StepTimings()
+
+   def stepEnv(self, env, action):
+      """
+      Steps one environment, returning its step() result and how long it took.
+      """
+      start = time.perf_counter()
+      result = env.step(action)
+      return result, time.perf_counter() - start
+
+   def stepAsync(self, actions):
+      """
+      Starts stepping every environment and returns straight away.
+
+      Parameters:
+      -----------
+      actions : list
+         Action of each environment (see HaliteEnv.step)
+      """
+      assert self.futures is None, "stepWait() must be called before stepping again"
+      start = time.perf_counter()
+      self.futures = [self.executor.submit(self.stepEnv, env, action) for env, action in zip(self.envs, actions)]
+      self.submitted = time.perf_counter()
+      self.timings.add('submit', self.submitted - start)
+
+   def stepWait(self):
+      """
+      Waits for the step started by stepAsync() to finish.
+
+      Returns:
+      --------
+      results : list
+         What step() returned for each environment. Observations are the environments' own
+         arrays, which change on the next step.
+      """
+      assert self.futures is not None, "stepAsync() must be called first"
+      start = time.perf_counter()
+      self.timings.add('overlap', start - self.submitted)
+      try:
+         #Every environment has to be done before the next step, even if one of them failed
+         wait(self.futures)
+         results = [future.result() for future in self.futures]
+      finally:
+         self.futures = None
+      self.timings.add('wait', time.perf_counter() - start)
+      self.timings.add('simulate', max([seconds for result, seconds in results], default=0.0))
+      self.timings.steps += 1
+      return [result for result, seconds in results]
+
+   def step(self, actions):
+      """
+      Steps every environment and waits for them (stepAsync() followed by stepWait()).
+      """
+      self.stepAsync(actions)
+      return self.stepWait()
+
+   async def asyncStep(self, actions):
+      """
+      Coroutine version of step(): the event loop keeps running while the environments step.
+      """
+      self.stepAsync(actions)
+      if(self.futures):
+         await asyncio.wait([asyncio.wrap_future(future) for future in self.futures])
+      return self.stepWait()
+
+   def reset(self):
+      """
+      Resets every environment.
+      """
+      assert self.futures is None, "stepWait() must be called before resetting"
+      return [env.reset() for env in self.envs]
+
+   def close(self):
+      """
+      Shuts the thread pool down.
+      """
+      self.executor.shutdown(wait=True)
@@ -0,0 +1,164 @@
+import numpy as np
+from haliteenv.constants import Constants
+from haliteenv.engine import Map, defaultMapCache, spawnSeeds
+from haliteenv import kernels
+from haliteenv.profiling import StepProfiler
+
+class BatchedHaliteEnv:
+   """
+   Plays <numEnvs> Halite III games side by side. Every game is stored in one array and
+   each step resolves moves, collisions, deposits, spawns and extraction for all of the
+   games with the same handful of NumPy operations (see kernels.stepGames), instead of
+   looping over ships in Python like HaliteEnv.step.
+
+   Attributes:
+   -----------
+   self.maps : np.ndarray
+      Maps of every game, shape (numEnvs, mapSize, mapSize, 6). Layers are the same as HaliteEnv.map
+
+   self.playerHalite : np.ndarray
+      Halite of each player in each game, shape (numEnvs, numPlayers)
+
+   self.numEnvs : int
+      Number of games
+
+   self.mapSize : int
+      Size of map (for x and y)
+
+   self.numPlayers : int
+      Number of players
+
+   self.turn : int
+      Number of turns played since the last reset (every game plays in lockstep)
+
+   self.maxTurns : int
+      Number of turns in a game (see kernels.episodeLength)
+
+   self.profiler : StepProfiler
+      Profiler timing the phases of every step (None when not profiling)
+
+   self.randoms : list
+      Random generator of each game, drawing its unseeded maps
+   """
+   metadata = {'render_modes':[], 'map_size':0, 'num_players':0}
+
+   def __init__(self, numEnvs, numPlayers, mapType, mapSize, regenMapOnReset = False, mapSeeds = None, mapCache = None, profiler = None, seed = None):
+      """
+      BatchedHaliteEnv initialization function. Arguments match HaliteEnv, plus the number of games.
+      Seeded maps are handed out to the games in order.
+      Each game gets its own random generator, seeded with spawnSeeds(<seed>, numEnvs)[i] (or
+      <seed>[i] if <seed> is a list of one SeedSequence per game), so game i generates the same
+      maps as HaliteEnv(..., seed=spawnSeeds(<seed>, numEnvs)[i]).
+      """
+      self.numEnvs = numEnvs
+      self.numPlayers = numPlayers
+      self.mapSize = mapSize.value
+      self.regenMap = regenMapOnReset
+      self.mapSeeds = mapSeeds
+      self.mapCache = defaultMapCache if mapCache is None else mapCache
+      self.mapIndex = 0
+      self.randoms = [np.random.default_rng(gameSeed) for gameSeed in (seed if isinstance(seed, list) else spawnSeeds(seed, numEnvs))]
+      assert len(self.randoms) == numEnvs, "A seed is needed for every game"
+      self.metadata = dict(self.metadata, map_size=mapSize.value, num_players=numPlayers)
+      self.maps = self.generateMaps()
+      self.playerHalite = np.full((numEnvs, numPlayers), float(Constants.INITIAL_ENERGY))
+      self.turn = 0
+      self.maxTurns = kernels.episodeLength(self.mapSize)
+      self.profiler = StepProfiler() if profiler is True else (profiler or None)
+      if(not self.regenMap):
+         self.originalMaps = self.maps.copy()
+
+   def step(self, actions):
+      """
+      Step of every game.
+
+      Parameters:
+      -----------
+      actions : np.ndarray or tuple
+         Actions of shape (numEnvs, mapSize, mapSize, numPlayers), where actions[i] is the
+         action array HaliteEnv.step would take for game i.
+         Or sparse actions as a tuple of parallel arrays (game, player, cell, move), with
+         player = ownership id - 1 and cell = y * mapSize + x. Cells left out Do Nothing.
+
+      Returns:
+      --------
+      ob, reward, episode_over, info : tuple
+         ob (tuple):
+            (<maps>, <playerHalite>) where <maps> is layers 0 - 4 of every game
+         reward (array):
+            Reward for each player of each game, shape (numEnvs, numPlayers), with the
+            terminal rewards added on the last turn (see HaliteEnv.step)
+         episode_over (array):
+            Whether each game is over, shape (numEnvs,). Every game ends on the same turn.
+         info (dict)
+            The turn just played
+      """
+      assert self.turn < self.maxTurns, "The games are over, call reset()"
+      if(self.profiler is not None):
+         self.profiler.start()
+      if(not isinstance(actions, np.ndarray)):
+         actions = kernels.sparseActionsFromLists(*actions, self.mapSize, self.numPlayers)
+      reward = kernels.stepGames(self.maps, self.playerHalite, actions, self.profiler)
+      self.turn += 1
+      episodeOver = np.full(self.numEnvs, self.turn >= self.maxTurns)
+      if(self.turn >= self.maxTurns):
+         reward += kernels.terminalRewards(self.playerHalite)
+      if(self.profiler is not None):
+         self.profiler.lap('other')
+         self.profiler.finish()
+      return ((self.maps[:, :, :, :5], self.playerHalite), reward, episodeOver, {'turn':self.turn})
+
+   def reset(self):
+      """
+      Resets every game. If <regenMapOnReset> in __init__() is True, the maps are regenerated.
+      Otherwise, they are replaced with copies of the originals.
+      The new games are copied into the existing arrays, so views of them stay valid.
+      """
+      if(not self.regenMap):
+         np.copyto(self.maps, self.originalMaps)
+      else:
+         np.copyto(self.maps, self.generateMaps())
+      self.playerHalite.fill(Constants.INITIAL_ENERGY)
+      self.turn = 0
+      return (self.maps[:, :, :, :5], self.playerHalite)
+
+   def runEpisodes(self, n, policies):
+      """
+      Plays <n> complete games, <numEnvs> at a time, resetting between rounds.
+
+      Parameters:
+      -----------
+      n : int
+         Number of games
+      policies : list
+         A function per player, called as policies[i](ob, i) with the observation from step().
+         It returns player i's moves in every game, shape (numEnvs, mapSize, mapSize).
+
+      Returns:
+      --------
+      totalReward, finalHalite : tuple
+         Sum of each player's rewards and each player's halite at the end, shape (n, numPlayers)
+      """
+      rounds = -(-n // self.numEnvs)
+      totalReward = np.zeros((rounds, self.numEnvs, self.numPlayers))
+      finalHalite = np.zeros((rounds, self.numEnvs, self.numPlayers))
+      actions = np.zeros((self.numEnvs, self.mapSize, self.mapSize, self.numPlayers), dtype=np.int64)
+      for round in range(0, rounds):
+         ob = self.reset()
+         while self.turn < self.maxTurns:
+            for player, policy in enumerate(policies):
+               actions[:, :, :, player] = policy(ob, player)
+            ob, reward, episodeOver, info = self.step(actions)
+            totalReward[round] += reward
+         finalHalite[round] = self.playerHalite
+      return totalReward.reshape(-1, self.numPlayers)[:n], finalHalite.reshape(-1, self.numPlayers)[:n]
+
+   def generateMaps(self):
+      """
+      Generates the maps of the next games, taking them from the map cache if they are seeded.
+      """
+      if(self.mapSeeds is None):
+         return np.stack([Map.generateFractalMap(self.mapSize, self.numPlayers, random=random) for random in self.randoms])
+      seeds = [self.mapSeeds[(self.mapIndex + i) % len(self.mapSeeds)] for i in range(0, self.numEnvs)]
+      self.mapIndex += self.numEnvs
+      return np.stack([self.mapCache.get(seed, self.mapSize, self.numPlayers) for seed in seeds])
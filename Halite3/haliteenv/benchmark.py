@@ -0,0 +1,194 @@
+"""
+Benchmark of HaliteEnv across map sizes, player counts and fleet sizes. For each configuration it
+measures step latency (percentiles over many steps, each from the same synthetic fleet), reset
+and map generation time, and the memory of one environment. It also times how long a fresh
+interpreter takes to import the package's entry points, which is what starting a worker process
+costs. Results are written as JSON so runs can be compared across versions:
+   python -m haliteenv.benchmark --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from haliteenv.engine import HaliteEngine, Map, MapType, MapSize, spawnSeeds
+
+PERCENTILES = [50, 90, 99]
+#Imports timed by importTime, from the lightest entry point to the whole package with gym
+IMPORTS = ['haliteenv', 'haliteenv.engine', 'haliteenv.batched', 'haliteenv.subproc', 'haliteenv.haliteenv']
+#Heavy dependencies reported as loaded (or not) by each import
+HEAVY_MODULES = ['gym', 'matplotlib', 'multiprocessing']
+
+def placeFleet(env, numShips, random):
+   """
+   Puts <numShips> ships (split evenly between the players) with random cargo on random empty
+   cells of <env>'s map, replacing any ships already there.
+   """
+   map = env.map
+   map[:, :, 3] = 0
+   empty = map[:, :, 2] == 0
+   map[empty, 1] = 0
+   map[empty, 4] = 0
+   cells = random.choice(np.flatnonzero(empty), numShips, replace=False)
+   y, x = np.unravel_index(cells, map.shape[:2])
+   map[y, x, 1] = random.integers(0, 1000, numShips)
+   map[y, x, 3] = 1
+   map[y, x, 4] = np.arange(numShips) % env.numPlayers + 1
+
+def percentiles(seconds):
+   """
+   Mean, max and PERCENTILES of <seconds>, keyed by name.
+   """
+   result = {'mean':float(np.mean(seconds)), 'max':float(np.max(seconds))}
+   result.update({'p' + str(p): float(value) for p, value in zip(PERCENTILES, np.percentile(seconds, PERCENTILES))})
+   return result
+
+def benchmarkConfig(mapSize, numPlayers, numShips, numSteps, numResets, seed):
+   """
+   Benchmarks one configuration. Everything random (the maps, fleet and actions) is drawn from
+   <seed> (a SeedSequence or int), so a configuration is the same in every run.
+
+   Returns:
+   --------
+   result : dict
+      Step latency percentiles (seconds), reset and map generation time (seconds)
+      and bytes allocated by one environment
+   """
+   envSeed, drawSeed = spawnSeeds(seed, 2)
+   random = np.random.default_rng(drawSeed)
+   #Play a turn first so the kernels' lookup tables for this map size exist before memory is
+   #traced, or only the first configuration of each map size would count them
+   warmup = HaliteEngine(numPlayers, MapType.BASIC, mapSize, seed=0)
+   warmupRandom = np.random.default_rng(0)
+   placeFleet(warmup, 10, warmupRandom)
+   warmup.step(warmupRandom.integers(0, 7, (warmup.mapSize, warmup.mapSize, numPlayers)))
+   del warmup
+   tracemalloc.start()
+   env = HaliteEngine(numPlayers, MapType.BASIC, mapSize, seed=envSeed)
+   memory = tracemalloc.get_traced_memory()[0]
+   tracemalloc.stop()
+
+   placeFleet(env, numShips, random)
+   state = env.getState()
+   steps = np.empty(numSteps)
+   for i in range(0, numSteps):
+      #Every step starts from the same fleet, so the number of ships doesn't drift
+      env.setState(state)
+      action = random.integers(0, 7, (env.mapSize, env.mapSize, numPlayers))
+      start = time.perf_counter()
+      env.step(action)
+      steps[i] = time.perf_counter() - start
+
+   resets = np.empty(numResets)
+   mapGens = np.empty(numResets)
+   for i in range(0, numResets):
+      start = time.perf_counter()
+      env.reset()
+      resets[i] = time.perf_counter() - start
+      start = time.perf_counter()
+      Map.generateFractalMap(env.mapSize, numPlayers, random=random)
+      mapGens[i] = time.perf_counter() - start
+   return {'mapSize':mapSize.value, 'numPlayers':numPlayers, 'numShips':numShips,
+           'step':percentiles(steps), 'reset':percentiles(resets), 'mapGeneration':percentiles(mapGens),
+           'memoryBytes':memory}
+
+def importTime(module, repeats = 5):
+   """
+   Times importing <module> in a fresh interpreter, <repeats> times.
+
+   Returns:
+   --------
+   result : dict
+      Percentiles of the seconds the import took (see percentiles), and which of HEAVY_MODULES
+      it loaded
+   """
+   script = ("import sys, time\nstart = time.perf_counter()\nimport " + module +
+             "\nprint(time.perf_counter() - start)\nprint(' '.join([m for m in " + repr(HEAVY_MODULES) + " if m in sys.modules]))")
+   #Run from the folder haliteenv is in, whatever the current directory
+   root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+   seconds = []
+   for i in range(0, repeats):
+      output = subprocess.check_output([sys.executable, '-c', script], cwd=root, stderr=subprocess.DEVNULL, text=True).split('\n')
+      seconds.append(float(output[0]))
+   result = {'module':module, 'seconds':percentiles(seconds)}
+   result.update({'loads_' + name: name in output[1].split() for name in HEAVY_MODULES})
+   return result
+
+def gitCommit():
+   """
+   Commit of the code being benchmarked (None outside of a git checkout).
+   """
+   try:
+      return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+   except (OSError, subprocess.CalledProcessError):
+      return None
+
+def runBenchmark(mapSizes = list(MapSize), playerCounts = [2, 4], fleetSizes = [0, 10, 50, 100, 200], numSteps = 200, numResets = 10, seed = 0):
+   """
+   Benchmarks every combination of <mapSizes>, <playerCounts> and <fleetSizes>, after the import
+   times of IMPORTS. Configurations that fail are reported with their error instead of stopping the run. Each configuration gets
+   its own SeedSequence made of <seed> and the configuration, so results don't depend on which
+   others are run.
+
+   Returns:
+   --------
+   results : dict
+      'machine' (versions and platform), 'imports' (a dict per module, see importTime) and
+      'results' (a dict per configuration, see benchmarkConfig)
+   """
+   imports = []
+   for module in IMPORTS:
+      imports.append(importTime(module))
+      printImport(imports[-1])
+   results = []
+   for mapSize in mapSizes:
+      for numPlayers in playerCounts:
+         for numShips in fleetSizes:
+            configSeed = np.random.SeedSequence([seed, mapSize.value, numPlayers, numShips])
+            try:
+               result = benchmarkConfig(mapSize, numPlayers, numShips, numSteps, numResets, configSeed)
+            except Exception as error:
+               result = {'mapSize':mapSize.value, 'numPlayers':numPlayers, 'numShips':numShips, 'error':repr(error)}
+            results.append(result)
+            printResult(result)
+   machine = {'commit':gitCommit(), 'python':platform.python_version(), 'numpy':np.__version__,
+              'platform':platform.platform(), 'processor':platform.processor(), 'time':time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+   return {'machine':machine, 'numSteps':numSteps, 'numResets':numResets, 'imports':imports, 'results':results}
+
+def printImport(result):
+   """
+   Prints one module's import time as a line of a table.
+   """
+   loads = [name for name in HEAVY_MODULES if result['loads_' + name]]
+   print("import %-20s p50 %.4f s   loads %s" % (result['module'], result['seconds']['p50'], ', '.join(loads) or '-'))
+
+def printResult(result):
+   """
+   Prints one configuration's result as a line of a table.
+   """
+   config = "Map %2d  players %d  ships %3d" % (result['mapSize'], result['numPlayers'], result['numShips'])
+   if('error' in result):
+      print(config + "   failed: " + result['error'])
+      return
+   step = result['step']
+   print(config + "   step p50 %.6f  p90 %.6f  p99 %.6f   reset %.6f   map gen %.6f   memory %d KB" %
+         (step['p50'], step['p90'], step['p99'], result['reset']['mean'], result['mapGeneration']['mean'], result['memoryBytes'] // 1024))
+
+if __name__ == '__main__':
+   parser = argparse.ArgumentParser(description="Benchmark HaliteEnv across map sizes, player counts and fleet sizes")
+   parser.add_argument('--output', default='benchmark.json', help="JSON file to write the results to")
+   parser.add_argument('--sizes', nargs='+', default=[size.name for size in MapSize], choices=[size.name for size in MapSize])
+   parser.add_argument('--players', nargs='+', type=int, default=[2, 4])
+   parser.add_argument('--ships', nargs='+', type=int, default=[0, 10, 50, 100, 200])
+   parser.add_argument('--steps', type=int, default=200, help="Steps timed per configuration")
+   parser.add_argument('--resets', type=int, default=10, help="Resets and map generations timed per configuration")
+   parser.add_argument('--seed', type=int, default=0)
+   args = parser.parse_args()
+   results = runBenchmark([MapSize[size] for size in args.sizes], args.players, args.ships, args.steps, args.resets, args.seed)
+   with open(args.output, 'w') as file:
+      json.dump(results, file, indent=1)
+   print("Results written to " + args.output)
@@ -0,0 +1,272 @@
+import numpy as np
+from haliteenv.constants import Constants
+from haliteenv import kernels
+
+def batchView(ob):
+   """
+   Maps and halite of an observation with a leading game axis, whether it came from HaliteEnv
+   (one map, halite of shape (numPlayers, 1)) or a batched environment.
+
+   Returns:
+   --------
+   maps, playerHalite, batched : tuple
+      Maps of shape (numGames, mapSize, mapSize, layers), halite of shape (numGames, numPlayers)
+      and whether <ob> was already batched
+   """
+   maps, playerHalite = ob
+   if(maps.ndim == 3):
+      return maps[None], playerHalite.reshape(1, -1), False
+   return maps, playerHalite, True
+
+def spawnActions(maps, playerHalite, player, actions, maxShips, reserve):
+   """
+   Sets action 1 (Spawn ship) on <player>'s empty Factories in every game where the player has
+   fewer than <maxShips> ships and can pay for one while keeping <reserve> halite.
+
+   Parameters:
+   -----------
+   maps, playerHalite : np.ndarray
+      Batched observation (see batchView)
+   player : int
+      Player index (ownership id - 1)
+   actions : np.ndarray
+      Actions of shape (numGames, mapSize, mapSize), modified in place
+   maxShips : int
+      Most ships to keep
+   reserve : float
+      Halite to keep after paying for the ship
+   """
+   owned = maps[:, :, :, 4] == player + 1
+   numShips = np.count_nonzero(owned & (maps[:, :, :, 3] == 1), axis=(1, 2))
+   afford = (playerHalite[:, player] >= Constants.NEW_ENTITY_ENERGY_COST + reserve) & (numShips < maxShips)
+   factories = owned & (maps[:, :, :, 2] == 1) & (maps[:, :, :, 3] == 0)
+   actions[factories & afford[:, None, None]] = 1
+
+class RandomBot:
+   """
+   Baseline policy moving every ship in a random direction (or leaving it still) and spawning on
+   its Factory at random. Like every bot here it's called as a policy of runEpisodes,
+   bot(ob, player), with a HaliteEnv observation or batched maps from BatchedHaliteEnv/
+   SubprocVecHaliteEnv, and returns player's moves (0 - 6, see HaliteEnv.step) of shape
+   (mapSize, mapSize) or (numGames, mapSize, mapSize) (int8). Full maps are needed, not deltas.
+   """
+   def __init__(self, spawnChance = 0.5, stayChance = 0.2, seed = None):
+      """
+      RandomBot initialization function.
+
+      Parameters:
+      -----------
+      spawnChance : float
+         Chance of trying to spawn a ship each turn
+      stayChance : float
+         Chance of a ship staying still (and mining) instead of moving
+      seed : int or np.random.SeedSequence
+         Seed of the bot's random generator
+      """
+      self.spawnChance = spawnChance
+      self.stayChance = stayChance
+      self.random = np.random.default_rng(seed)
+
+   def __call__(self, ob, player):
+      maps, playerHalite, batched = batchView(ob)
+      actions = np.zeros(maps.shape[:3], dtype=np.int8)
+      owned = maps[:, :, :, 4] == player + 1
+      #Only as many random numbers as there are ships and Factories
+      ships = np.nonzero(owned & (maps[:, :, :, 3] == 1))
+      moves = self.random.integers(3, 7, len(ships[0]), dtype=np.int8)
+      actions[ships] = np.where(self.random.random(len(moves)) < self.stayChance, 0, moves)
+      factories = np.nonzero(owned & (maps[:, :, :, 2] == 1) & (maps[:, :, :, 3] == 0))
+      actions[factories] = np.where(self.random.random(len(factories[0])) < self.spawnChance, 1, 0)
+      return actions if batched else actions[0]
+
+class SpawnerBot:
+   """
+   Baseline policy that mostly builds ships: it spawns whenever its Factory is empty and it can
+   pay, up to <maxShips>, and spreads its ships out around the Factory. Each ship moves away from
+   the Factory onto a free cell (no ship or structure) until it is at least <radius> cells away
+   on a cell with at least <mineHalite> halite, then stays still mining, and goes straight back
+   to deposit once it carries <returnCargo> halite (a ship
+   leaving the Factory swaps places with one coming back). Ships stay put for a turn when they
+   can't pay for the move, when an allied ship already goes to that cell, or when there is no
+   free cell further out. See RandomBot for how bots are called.
+   """
+   def __init__(self, maxShips = 20, reserve = 0, radius = 3, returnCargo = 500, mineHalite = 50):
+      """
+      SpawnerBot initialization function.
+
+      Parameters:
+      -----------
+      maxShips : int
+         Most ships to keep
+      reserve : float
+         Halite to keep after paying for a ship
+      radius : int
+         Distance from the Factory ships spread out to at least
+      returnCargo : float
+         Cargo at which ships head back to deposit it
+      mineHalite : float
+         Halite a cell needs for a ship to stop on it and mine
+      """
+      self.maxShips = maxShips
+      self.reserve = reserve
+      self.radius = radius
+      self.returnCargo = returnCargo
+      self.mineHalite = mineHalite
+
+   def __call__(self, ob, player):
+      maps, playerHalite, batched = batchView(ob)
+      numGames, mapSize = maps.shape[:2]
+      numCells = mapSize * mapSize
+      flat = maps.reshape(numGames, numCells, -1)
+      owned = flat[:, :, 4] == player + 1
+      factoryGame, factory = np.nonzero(owned & (flat[:, :, 2] == 1))
+      home = np.zeros(numGames, dtype=np.int64)
+      home[factoryGame] = factory
+      b, cell = np.nonzero(owned & (flat[:, :, 3] == 1))
+      #Columns 1 - 4 of the neighbor table are where moves 3 - 6 lead
+      neighbors = kernels.neighborTable(mapSize)[cell, 1:]
+      distance = kernels.cellDistance(cell, home[b], mapSize)
+      step = kernels.cellDistance(neighbors, home[b, None], mapSize) - distance[:, None]
+      free = (flat[b[:, None], neighbors, 3] == 0) & (flat[b[:, None], neighbors, 2] == 0)
+      #Layer 1 holds the structure's halite on Factories/Dropoffs, where ships carry nothing
+      cargo = np.where(flat[b, cell, 2] != 0, 0, flat[b, cell, 1])
+      returning = cargo >= self.returnCargo
+      comingBack = np.zeros((numGames, numCells), dtype=bool)
+      comingBack[b[returning], cell[returning]] = True
+
+      #Returning ships head for the Factory, the others out to free cells (or, from the
+      #Factory, onto a ship coming back to it, which passes them)
+      inward = (step < 0) & (free | (neighbors == home[b, None])) & returning[:, None]
+      outward = (step > 0) & (free | ((distance == 0)[:, None] & comingBack[b[:, None], neighbors]))
+      outward &= (((distance < self.radius) | (flat[b, cell, 0] < self.mineHalite)) & ~returning)[:, None]
+      candidates = (inward | outward) & (cargo >= flat[b, cell, 0] / Constants.MOVE_COST_RATIO)[:, None]
+      move = np.argmax(candidates, axis=1)
+      moving = np.flatnonzero(candidates[np.arange(len(cell)), move])
+      #Allied ships moving onto the same cell would all be sent back: only the first one goes
+      destination = b[moving] * numCells + neighbors[moving, move[moving]]
+      moving = moving[np.unique(destination, return_index=True)[1]]
+
+      actions = np.zeros((numGames, numCells), dtype=np.int8)
+      actions[b[moving], cell[moving]] = 3 + move[moving]
+      actions = actions.reshape(numGames, mapSize, mapSize)
+      spawnActions(maps, playerHalite, player, actions, self.maxShips, self.reserve)
+      return actions if batched else actions[0]
+
+class GreedyMinerBot:
+   """
+   Baseline policy of greedy miners. Each ship:
+      - heads back to its player's closest Factory/Dropoff once it carries <returnCargo> halite
+      - otherwise mines its cell while the cell has at least <mineHalite> halite
+      - otherwise moves to the neighboring cell with the most halite within <spread> of it
+   Ships stay still when they can't pay for the move, and when an allied ship already goes to
+   (or stays on) the cell they would move to, as the move would fail. Ships are spawned like
+   SpawnerBot does. Every ship of every game is decided at once, with the neighbor and radius
+   tables of the kernels, so the cost depends on the number of ships rather than the map size.
+   With <distances>, distances home are taken from the observation's distance layers
+   (HaliteEnv with distanceObservations) instead of being worked out from the map.
+   See RandomBot for how bots are called.
+   """
+   def __init__(self, returnCargo = 800, mineHalite = 100, maxShips = 12, reserve = 0, spread = 1, wander = 20.0, seed = None, distances = False):
+      """
+      GreedyMinerBot initialization function.
+
+      Parameters:
+      -----------
+      returnCargo : float
+         Cargo at which ships head back to deposit it
+      mineHalite : float
+         Halite a cell needs for a ship to keep mining it
+      maxShips : int
+         Most ships to keep
+      reserve : float
+         Halite to keep after paying for a ship
+      spread : int
+         Radius of the area whose average halite draws ships towards it
+      wander : float
+         Most random halite added to each direction, which breaks ties and keeps ships
+         from going back and forth between two cells
+      seed : int or np.random.SeedSequence
+         Seed of the bot's random generator
+      distances : bool
+         Whether observations have the distance layers of distanceObservations
+      """
+      self.returnCargo = returnCargo
+      self.mineHalite = mineHalite
+      self.maxShips = maxShips
+      self.reserve = reserve
+      self.spread = spread
+      self.wander = wander
+      self.random = np.random.default_rng(seed)
+      self.distances = distances
+
+   def __call__(self, ob, player):
+      maps, playerHalite, batched = batchView(ob)
+      numGames, mapSize = maps.shape[:2]
+      numCells = mapSize * mapSize
+      numPlayers = playerHalite.shape[1]
+      flat = maps.reshape(numGames, numCells, -1)
+      owned = flat[:, :, 4] == player + 1
+      b, cell = np.nonzero(owned & (flat[:, :, 3] == 1))
+      halite = flat[:, :, 0]
+      here = halite[b, cell]
+      #Layer 1 holds the structure's halite on Factories/Dropoffs, where ships carry nothing
+      cargo = np.where(flat[b, cell, 2] != 0, 0, flat[b, cell, 1])
+      #Columns 1 - 4 of the neighbor table are where moves 3 - 6 lead
+      neighbors = kernels.neighborTable(mapSize)[cell, 1:]
+      noise = self.random.random(neighbors.shape)
+
+      #Halite around each neighboring cell, so ships head towards rich areas, not just rich cells
+      area = halite[b[:, None, None], kernels.radiusTable(mapSize, self.spread)[neighbors]].mean(axis=2)
+      move = np.argmax(area + noise * self.wander, axis=1)
+      returning = np.flatnonzero(cargo >= self.returnCargo)
+      if(len(returning)):
+         if(self.distances):
+            assert flat.shape[2] == 5 + numPlayers, "distances needs observations with distanceObservations"
+            distance = flat[b[returning, None], neighbors[returning], 5 + player]
+         else:
+            distance = self.homeDistance(owned & (flat[:, :, 2] != 0), b[returning], neighbors[returning], mapSize)
+         #Distances are whole numbers, so the noise only breaks ties
+         move[returning] = np.argmin(distance + noise[returning], axis=1)
+
+      stay = (cargo < self.returnCargo) & (here >= self.mineHalite)
+      stay |= cargo < here / Constants.MOVE_COST_RATIO
+      #Allied ships moving onto the same cell would all be sent back: only the first one goes
+      destination = b * numCells + np.where(stay, cell, neighbors[np.arange(len(cell)), move])
+      moving = np.flatnonzero(~stay)
+      first = np.zeros(len(moving), dtype=bool)
+      first[np.unique(destination[moving], return_index=True)[1]] = True
+      stay[moving[~first]] = True
+      #Neither can ships move onto an ally that stays
+      stay |= np.isin(destination, b[stay] * numCells + cell[stay]) & (destination != b * numCells + cell)
+
+      actions = np.zeros((numGames, numCells), dtype=np.int8)
+      actions[b, cell] = np.where(stay, 0, 3 + move)
+      actions = actions.reshape(numGames, mapSize, mapSize)
+      spawnActions(maps, playerHalite, player, actions, self.maxShips, self.reserve)
+      return actions if batched else actions[0]
+
+   def homeDistance(self, structures, b, cells, mapSize):
+      """
+      Distance from each of <cells> (of games <b>) to the closest of the player's Factories/Dropoffs.
+
+      Parameters:
+      -----------
+      structures : np.ndarray
+         Whether each cell is one of the player's Factories/Dropoffs, shape (numGames, mapSize * mapSize)
+      b : np.ndarray
+         Game of each row of <cells>
+      cells : np.ndarray
+         Cells of shape (n, k)
+
+      Returns:
+      --------
+      distance : np.ndarray
+         Distances of shape (n, k)
+      """
+      sb, sc = np.nonzero(structures)
+      counts = np.bincount(sb, minlength=len(structures))
+      #Structures of each game lined up in a row, padded with the game's first one
+      padded = np.zeros((len(structures), max(counts.max(), 1)), dtype=np.int64)
+      padded[sb, np.arange(len(sb)) - np.repeat(np.cumsum(counts) - counts, counts)] = sc
+      padded = np.where(np.arange(padded.shape[1]) < np.maximum(counts, 1)[:, None], padded, padded[:, :1])
+      return kernels.cellDistance(cells[:, :, None], padded[b][:, None, :], mapSize).min(axis=2)
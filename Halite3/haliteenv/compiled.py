@@ -0,0 +1,215 @@
+"""
+Compiled backend for playing one game at a time (HaliteEnv(..., compiled=True)). A whole turn is
+played by playTurn, a loop over the flat map that Numba compiles to machine code. Batching doesn't
+help a planner stepping a single game, so there the loop beats the NumPy kernels, whose cost is
+mostly the overhead of many small array operations.
+Without Numba the loops still run (as plain Python, slowly), which is how tests/test_compiled.py
+compares them against the NumPy kernels anywhere.
+"""
+import math
+import numpy as np
+from haliteenv.constants import Constants
+
+try:
+   from numba import njit
+   AVAILABLE = True
+except ImportError:
+   AVAILABLE = False
+   def njit(**options):
+      return lambda function: function
+
+#Numba freezes module globals when compiling, so the constants are copied out of Constants
+DROPOFF_COST = float(Constants.DROPOFF_COST)
+NEW_ENTITY_ENERGY_COST = float(Constants.NEW_ENTITY_ENERGY_COST)
+MOVE_COST_RATIO = Constants.MOVE_COST_RATIO
+INSPIRED_MOVE_COST_RATIO = Constants.INSPIRED_MOVE_COST_RATIO
+EXTRACT_RATIO = Constants.EXTRACT_RATIO
+INSPIRED_EXTRACT_RATIO = Constants.INSPIRED_EXTRACT_RATIO
+INSPIRED_BONUS = 1 + Constants.INSPIRED_BONUS_MULTIPLIER
+MAX_ENERGY = float(Constants.MAX_ENERGY)
+INSPIRATION_ENABLED = Constants.INSPIRATION_ENABLED
+INSPIRATION_SHIP_COUNT = Constants.INSPIRATION_SHIP_COUNT
+
+@njit(cache=True)
+def playTurn(map, playerHalite, keys, commands, neighbors, radius):
+   """
+   Plays one turn of one game with the same rules, in the same order, as kernels.resolveTurn,
+   kernels.inspirationMap and kernels.extractHalite: Dropoffs, moves (settled together),
+   spawns, inspiration and extraction.
+
+   Parameters:
+   -----------
+   map : np.ndarray
+      Map of shape (mapSize, mapSize, 6) (C-contiguous), modified in place
+   playerHalite : np.ndarray
+      Halite of each player, shape (numPlayers,), modified in place
+   keys, commands : np.ndarray
+      Sparse actions of the game (see kernels.sparseActions), key = cell * numPlayers + player
+   neighbors : np.ndarray
+      kernels.neighborTable of the map size
+   radius : np.ndarray
+      kernels.radiusTable of the map size and INSPIRATION_RADIUS
+
+   Returns:
+   --------
+   invalid : np.ndarray
+      Number of invalid actions of each player, shape (numPlayers,)
+   """
+   numCells = map.shape[0] * map.shape[1]
+   numPlayers = playerHalite.shape[0]
+   cells = map.reshape(numCells, map.shape[2])
+   invalid = np.zeros(numPlayers)
+   #Dense lookup of the actions, filled backwards so the first command given for a cell wins
+   command = np.zeros(numCells * numPlayers, dtype=np.int64)
+   for i in range(len(keys) - 1, -1, -1):
+      if(keys[i] >= 0 and keys[i] < len(command)):
+         command[keys[i]] = commands[i]
+
+   numShips = 0
+   source = np.empty(numCells, dtype=np.int64)
+   for cell in range(0, numCells):
+      if(cells[cell, 3] == 1):
+         source[numShips] = cell
+         numShips += 1
+   source = source[:numShips]
+   owner = np.empty(numShips, dtype=np.int64)
+   act = np.empty(numShips, dtype=np.int64)
+   for i in range(0, numShips):
+      owner[i] = int(cells[source[i], 4]) - 1
+      act[i] = command[source[i] * numPlayers + owner[i]]
+
+   #Dropoffs, paid for in order out of what each player had at the start of the turn
+   budget = playerHalite.copy()
+   running = np.zeros(numPlayers)
+   converted = np.zeros(numShips, dtype=np.bool_)
+   for i in range(0, numShips):
+      if(act[i] != 2):
+         continue
+      cell, player = source[i], owner[i]
+      if(cells[cell, 2] != 0):
+         invalid[player] += 1
+         continue
+      cost = DROPOFF_COST - cells[cell, 0]
+      running[player] += cost
+      if(running[player] <= budget[player]):
+         converted[i] = True
+         playerHalite[player] -= cost
+         cells[cell, 3] = 0
+         cells[cell, 2] = -1
+         cells[cell, 0] = 0
+      else:
+         invalid[player] += 1
+
+   #Moves: destinations first, then allied ships bounced back until none share a cell
+   cargo = np.zeros(numShips)
+   onStructure = np.zeros(numShips, dtype=np.bool_)
+   destination = source.copy()
+   allied = np.zeros(numCells * numPlayers, dtype=np.int64)
+   for i in range(0, numShips):
+      if(converted[i]):
+         continue
+      cell, player = source[i], owner[i]
+      onStructure[i] = cells[cell, 2] != 0
+      if(not onStructure[i]):
+         cargo[i] = cells[cell, 1]
+      failed = False
+      if(act[i] >= 3 and act[i] <= 6):
+         ratio = INSPIRED_MOVE_COST_RATIO if cells[cell, 5] == 1 else MOVE_COST_RATIO
+         if(cargo[i] < cells[cell, 0] / ratio):
+            failed = True
+         else:
+            destination[i] = neighbors[cell, act[i] - 2]
+      #Cannot move on top of an enemy Factory/Dropoff
+      target = destination[i]
+      if(cells[target, 2] != 0 and cells[target, 4] != player + 1):
+         destination[i] = cell
+         failed = True
+      if(failed):
+         invalid[player] += 1
+      allied[destination[i] * numPlayers + player] += 1
+   bounced = np.zeros(numShips, dtype=np.bool_)
+   while True:
+      anyBounced = False
+      for i in range(0, numShips):
+         bounced[i] = (not converted[i] and destination[i] != source[i]
+                       and allied[destination[i] * numPlayers + owner[i]] > 1)
+         anyBounced = anyBounced or bounced[i]
+      if(not anyBounced):
+         break
+      for i in range(0, numShips):
+         if(bounced[i]):
+            allied[destination[i] * numPlayers + owner[i]] -= 1
+            destination[i] = source[i]
+            allied[destination[i] * numPlayers + owner[i]] += 1
+            invalid[owner[i]] += 1
+   #Whatever is left sharing a cell belongs to different players
+   occupied = np.zeros(numCells, dtype=np.int64)
+   for i in range(0, numShips):
+      if(not converted[i]):
+         occupied[destination[i]] += 1
+
+   #Lift every ship off the map, then put the survivors down on their new cells
+   for i in range(0, numShips):
+      if(converted[i]):
+         continue
+      cell = source[i]
+      cells[cell, 3] = 0
+      if(not onStructure[i]):
+         cells[cell, 1] = 0
+         cells[cell, 4] = 0
+   for i in range(0, numShips):
+      if(not converted[i] and occupied[destination[i]] > 1):
+         cells[destination[i], 0] += cargo[i]
+   for i in range(0, numShips):
+      if(converted[i] or occupied[destination[i]] > 1):
+         continue
+      cell = destination[i]
+      if(cells[cell, 2] != 0):
+         cells[cell, 1] += cargo[i]
+         playerHalite[owner[i]] += cargo[i]
+      else:
+         cells[cell, 1] = cargo[i]
+      cells[cell, 3] = 1
+      cells[cell, 4] = owner[i] + 1
+
+   #Spawns, paid for in order out of what each player has after deposits
+   budget[:] = playerHalite
+   running[:] = 0
+   for cell in range(0, numCells):
+      if(cells[cell, 2] != 1):
+         continue
+      player = int(cells[cell, 4]) - 1
+      if(command[cell * numPlayers + player] != 1):
+         continue
+      if(cells[cell, 3] != 0):
+         invalid[player] += 1
+         continue
+      running[player] += NEW_ENTITY_ENERGY_COST
+      if(running[player] <= budget[player]):
+         playerHalite[player] -= NEW_ENTITY_ENERGY_COST
+         cells[cell, 3] = 1
+      else:
+         invalid[player] += 1
+
+   #Inspiration: at least INSPIRATION_SHIP_COUNT enemy ships within the radius
+   for cell in range(0, numCells):
+      inspired = False
+      if(INSPIRATION_ENABLED and cells[cell, 3] == 1):
+         enemies = 0
+         for near in radius[cell]:
+            if(cells[near, 3] == 1 and cells[near, 4] != 0 and cells[near, 4] != cells[cell, 4]):
+               enemies += 1
+         inspired = enemies >= INSPIRATION_SHIP_COUNT
+      cells[cell, 5] = 1.0 if inspired else 0.0
+
+   #Extraction by every ship not on a Factory/Dropoff
+   for cell in range(0, numCells):
+      if(cells[cell, 3] != 1 or cells[cell, 2] != 0):
+         continue
+      inspired = cells[cell, 5] == 1
+      extracted = float(math.ceil(cells[cell, 0] / (INSPIRED_EXTRACT_RATIO if inspired else EXTRACT_RATIO)))
+      gained = extracted * INSPIRED_BONUS if inspired else extracted
+      room = MAX_ENERGY - cells[cell, 1]
+      cells[cell, 1] += min(gained, room)
+      cells[cell, 0] -= min(extracted, room)
+   return invalid
@@ -0,0 +1,34 @@
+class Constants:
+   """
+   Stores the constants used by the Halite III game as of
+   early December 2018
+   """
+   CAPTURE_ENABLED = False
+   CAPTURE_RADIUS = 3
+   DEFAULT_MAP_HEIGHT = 48
+   DEFAULT_MAP_WIDTH = 48
+   DROPOFF_COST = 4000
+   DROPOFF_PENALTY_RATIO = 4
+   EXTRACT_RATIO = 4
+   FACTOR_EXP_1 = 2.0
+   FACTOR_EXP_2 = 2.0
+   INITIAL_ENERGY = 5000
+   INSPIRATION_ENABLED = True
+   INSPIRATION_RADIUS = 4
+   INSPIRATION_SHIP_COUNT = 2
+   INSPIRED_BONUS_MULTIPLIER = 2.0
+   INSPIRED_EXTRACT_RATIO = 4
+   INSPIRED_MOVE_COST_RATIO = 10
+   MAX_CELL_PRODUCTION = 1000
+   MAX_ENERGY = 1000
+   MAX_PLAYERS = 16
+   MAX_TURNS = 500
+   MAX_TURN_THRESHOLD = 64
+   MIN_CELL_PRODUCTION = 900
+   MIN_TURNS = 400
+   MIN_TURN_THRESHOLD = 32
+   MOVE_COST_RATIO = 10
+   NEW_ENTITY_ENERGY_COST = 1000
+   PERSISTENCE = 0.7
+   SHIPS_ABOVE_FOR_CAPTURE = 3
+   STRICT_ERRORS = False
@@ -0,0 +1,166 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from haliteenv.replay import ReplayReader
+
+def loadSegment(path, start, stop, dtype):
+   """
+   Reads the samples of turns <start> to <stop> of a replay. A sample of turn t is the observation
+   the players acted on (turn t - 1), the actions they took and the reward they got for them.
+
+   Returns:
+   --------
+   maps, playerHalite, actions, reward : tuple
+      Arrays of shape (n, mapSize, mapSize, 5), (n, numPlayers), (n, mapSize, mapSize, numPlayers)
+      and (n, numPlayers)
+   """
+   with ReplayReader(path) as replay:
+      n = stop - start
+      maps = np.empty((n, replay.mapSize, replay.mapSize, 5), dtype=dtype)
+      playerHalite = np.empty((n, replay.numPlayers), dtype=dtype)
+      actions = np.empty((n, replay.mapSize, replay.mapSize, replay.numPlayers), dtype=np.int8)
+      reward = np.empty((n, replay.numPlayers))
+      #Turns are read in order, so each observation is one delta away from the last
+      for i in range(0, n):
+         maps[i], halite = replay.observation(start + i - 1)
+         playerHalite[i] = halite[:, 0]
+         actions[i] = replay.denseActions(start + i)
+         reward[i] = replay.reward(start + i)
+   return maps, playerHalite, actions, reward
+
+class ReplayDataset:
+   """
+   Streams shuffled, fixed-size batches of (observation, action, reward) samples out of recorded
+   games (see HaliteEnv.startReplay), for training offline without simulating the games again.
+      for (maps, playerHalite), actions, reward in dataset:
+         ...
+   Games are cut into segments of consecutive turns, which a thread pool reads ahead of time in
+   a random order. The samples go into a shuffle buffer, and each batch is drawn at random
+   from it. Memory is bounded by the shuffle buffer plus the segments being read ahead.
+
+   Attributes:
+   -----------
+   self.games : list
+      (path, number of turns) of each replay
+
+   self.numSamples : int
+      Number of samples in an epoch
+   """
+   def __init__(self, paths, batchSize, shuffleSize = 4096, segmentLength = 64, prefetch = 8, numWorkers = 4, dropLast = True, dtype = np.float32, seed = None):
+      """
+      ReplayDataset initialization function.
+
+      Parameters:
+      -----------
+      paths : list
+         Replay files to read. Every replay must have the same map size and number of players.
+      batchSize : int
+         Samples per batch
+      shuffleSize : int
+         Samples held by the shuffle buffer (at least <batchSize>). Larger mixes games better.
+      segmentLength : int
+         Turns read together from one replay
+      prefetch : int
+         Segments read ahead of time
+      numWorkers : int
+         Threads reading segments
+      dropLast : bool
+         Whether to drop the last batch of an epoch if it's smaller than <batchSize>
+      dtype : np.dtype
+         Type of the observation arrays
+      seed : int
+         Seed of the shuffling (random if None)
+      """
+      assert shuffleSize >= batchSize, "shuffleSize must be at least batchSize"
+      self.batchSize = batchSize
+      self.shuffleSize = shuffleSize
+      self.segmentLength = segmentLength
+      self.prefetch = prefetch
+      self.numWorkers = numWorkers
+      self.dropLast = dropLast
+      self.dtype = dtype
+      self.random = np.random.default_rng(seed)
+      self.games = []
+      for path in paths:
+         with ReplayReader(path) as replay:
+            if(not self.games):
+               self.mapSize, self.numPlayers = replay.mapSize, replay.numPlayers
+            assert (replay.mapSize, replay.numPlayers) == (self.mapSize, self.numPlayers), path + " doesn't match the other replays"
+            self.games.append((path, len(replay)))
+      #The first turn of a replay is the starting map, which no actions led to
+      self.numSamples = sum([max(turns - 1, 0) for path, turns in self.games])
+
+   def __len__(self):
+      """
+      Number of batches in an epoch
+      """
+      if(self.dropLast):
+         return self.numSamples // self.batchSize
+      return -(-self.numSamples // self.batchSize)
+
+   def segments(self):
+      """
+      Every segment (path, start, stop) of every game, in a random order.
+      """
+      segments = [(path, start, min(start + self.segmentLength, turns)) for path, turns in self.games
+                  for start in range(1, turns, self.segmentLength)]
+      return [segments[i] for i in self.random.permutation(len(segments))]
+
+   def __iter__(self):
+      """
+      Goes through every sample once (one epoch), in a new random order each time.
+
+      Yields:
+      -------
+      ob, actions, reward : tuple
+         ob (tuple):
+            (<maps>, <playerHalite>), shape (batchSize, mapSize, mapSize, 5) and (batchSize, numPlayers)
+         actions (array):
+            Actions taken, shape (batchSize, mapSize, mapSize, numPlayers) (see HaliteEnv.step)
+         reward (array):
+            Reward of each player, shape (batchSize, numPlayers)
+      """
+      shapes = [((self.mapSize, self.mapSize, 5), self.dtype), ((self.numPlayers,), self.dtype),
+                ((self.mapSize, self.mapSize, self.numPlayers), np.int8), ((self.numPlayers,), np.float64)]
+      buffer = [np.empty((self.shuffleSize,) + shape, dtype=dtype) for shape, dtype in shapes]
+      fill = 0
+      pending = deque(self.segments())
+      with ThreadPoolExecutor(self.numWorkers) as executor:
+         loading = deque()
+         while pending or loading:
+            while pending and len(loading) < self.prefetch:
+               path, start, stop = pending.popleft()
+               loading.append(executor.submit(loadSegment, path, start, stop, self.dtype))
+            segment = loading.popleft().result()
+            added = 0
+            while added < len(segment[0]):
+               count = min(len(segment[0]) - added, self.shuffleSize - fill)
+               for array, samples in zip(buffer, segment):
+                  array[fill:fill + count] = samples[added:added + count]
+               fill += count
+               added += count
+               if(fill == self.shuffleSize):
+                  yield self.drawBatch(buffer, fill)
+                  fill -= self.batchSize
+      #Drain what's left of the buffer
+      while fill >= self.batchSize or (fill > 0 and not self.dropLast):
+         size = min(self.batchSize, fill)
+         yield self.drawBatch(buffer, fill, size)
+         fill -= size
+
+   def drawBatch(self, buffer, fill, size = None):
+      """
+      Takes <size> (batchSize if None) random samples out of the first <fill> of <buffer>, moving
+      samples from the end into the gaps they leave.
+      """
+      size = self.batchSize if size is None else size
+      chosen = self.random.choice(fill, size, replace=False)
+      batch = [array[chosen] for array in buffer]
+      tail = np.zeros(size, dtype=bool)
+      tail[chosen[chosen >= fill - size] - (fill - size)] = True
+      gaps = chosen[chosen < fill - size]
+      moved = np.flatnonzero(~tail) + (fill - size)
+      for array in buffer:
+         array[gaps] = array[moved]
+      maps, playerHalite, actions, reward = batch
+      return ((maps, playerHalite), actions, reward)
@@ -0,0 +1,106 @@
+import numpy as np
+
+class ObservationDelta:
+   """
+   What changed in an observation ((mapSize, mapSize, 5) map of HaliteEnv.step) since the last one.
+
+   Attributes:
+   -----------
+   self.indices : np.ndarray (int32)
+      Changed elements as indices into the flattened observation, i.e. cell * 5 + layer with
+      cell = y * mapSize + x
+
+   self.values : np.ndarray
+      New value of each changed element
+
+   self.reset : bool
+      True for the first delta of a game: it is relative to an empty (all zero) map
+   """
+   __slots__ = ('indices', 'values', 'reset')
+
+   def __init__(self, indices, values, reset):
+      self.indices = indices
+      self.values = values
+      self.reset = reset
+
+   @property
+   def cells(self):
+      """
+      Cell (y * mapSize + x) of each changed element
+      """
+      return self.indices // 5
+
+   @property
+   def layers(self):
+      """
+      Layer of each changed element
+      """
+      return self.indices % 5
+
+   @property
+   def nbytes(self):
+      return self.indices.nbytes + self.values.nbytes
+
+class DeltaTracker:
+   """
+   Keeps a copy of the last observation to turn full observations into ObservationDeltas
+   (the environment side, diff()) and ObservationDeltas back into full observations
+   (the consumer side, apply()).
+
+   Attributes:
+   -----------
+   self.observation : np.ndarray
+      The last observation, shape (mapSize, mapSize, 5)
+
+   self.pendingReset : bool
+      Whether the next delta starts a new game
+   """
+   def __init__(self, mapSize):
+      """
+      DeltaTracker initialization function. Starts from an empty map.
+      """
+      self.observation = np.zeros((mapSize, mapSize, 5))
+      self.pendingReset = True
+
+   def reset(self):
+      """
+      Starts over from an empty map, so the next delta holds everything on the new map.
+      """
+      self.observation.fill(0)
+      self.pendingReset = True
+
+   def diff(self, observation):
+      """
+      Works out what changed from the last observation to <observation> and remembers it.
+
+      Parameters:
+      -----------
+      observation : np.ndarray
+         New observation, shape (mapSize, mapSize, 5)
+
+      Returns:
+      --------
+      delta : ObservationDelta
+      """
+      flat = self.observation.reshape(-1)
+      new = observation.reshape(-1)
+      indices = np.flatnonzero(flat != new).astype(np.int32)
+      values = new[indices]
+      flat[indices] = values
+      delta = ObservationDelta(indices, values, self.pendingReset)
+      self.pendingReset = False
+      return delta
+
+   def apply(self, delta):
+      """
+      Applies <delta> to the last observation.
+      """
+      if(delta.reset):
+         self.observation.fill(0)
+      self.observation.reshape(-1)[delta.indices] = delta.values
+
+   def materialize(self):
+      """
+      Copy of the full observation, shape (mapSize, mapSize, 5)
+      """
+      return self.observation.copy()
@@ -0,0 +1,107 @@
+import numpy as np
+from haliteenv.constants import Constants
+
+class ObservationEncoder:
+   """
+   Turns observations (<map>, <playerHalite>) into float32 planes of shape (C, mapSize, mapSize)
+   seen from one player's perspective, ready to feed a network. The planes are written straight
+   into a buffer the caller allocates once (see allocate), so encoding allocates nothing.
+   Planes, with players ordered from the acting player (k = 0) onwards:
+      0               - Halite on the sea floor / haliteScale
+      1               - Halite carried by the ship on the cell / haliteScale
+      2               - Ship on the cell
+      3               - Factory on the cell
+      4               - Dropoff on the cell
+      5 + k           - Cell owned by player k (ship or structure)
+      5 + P + k       - Halite of player k / bankScale (the same everywhere)
+      5 + 2P + k      - With <distances>, distance to the closest Factory/Dropoff of player k / mapSize
+                        (needs observations from HaliteEnv with distanceObservations)
+
+   Attributes:
+   -----------
+   self.numChannels : int
+      Number of planes (C)
+   """
+   def __init__(self, numPlayers, haliteScale = Constants.MAX_ENERGY, bankScale = Constants.INITIAL_ENERGY, distances = False):
+      """
+      ObservationEncoder initialization function.
+
+      Parameters:
+      -----------
+      numPlayers : int
+         Number of players
+      haliteScale : float
+         Halite on the map is divided by this
+      bankScale : float
+         Player halite is divided by this
+      distances : bool
+         Whether to add the dropoff distance planes
+      """
+      self.numPlayers = numPlayers
+      self.haliteScale = 1.0 / haliteScale
+      self.bankScale = 1.0 / bankScale
+      self.distances = distances
+      self.numChannels = 5 + (3 if distances else 2) * numPlayers
+      self.scratch = {}
+
+   def allocate(self, mapSize, batchSize = None):
+      """
+      Allocates a buffer for encode(), shape (C, mapSize, mapSize) or (batchSize, C, mapSize, mapSize).
+      """
+      shape = (self.numChannels, mapSize, mapSize)
+      return np.zeros(shape if batchSize is None else (batchSize,) + shape, dtype=np.float32)
+
+   def encode(self, ob, player, out):
+      """
+      Encodes <ob> from the perspective of <player> into <out>.
+
+      Parameters:
+      -----------
+      ob : tuple
+         (<map>, <playerHalite>) as step() returns it: a map of shape (mapSize, mapSize, layers)
+         with halite of shape (numPlayers, 1) from HaliteEnv, or maps of shape
+         (batchSize, mapSize, mapSize, layers) with halite of shape (batchSize, numPlayers)
+         from BatchedHaliteEnv/SubprocVecHaliteEnv
+      player : int or np.ndarray
+         Player index (ownership id - 1) whose perspective to take, or one per batch element
+      out : np.ndarray
+         Buffer from allocate() matching the shape of <ob>
+
+      Returns:
+      --------
+      out : np.ndarray
+         <out>, filled in
+      """
+      maps, playerHalite = ob
+      planes = out
+      if(maps.ndim == 3):
+         maps, playerHalite, planes = maps[None], playerHalite.reshape(1, -1), out[None]
+      batchSize, mapSize = maps.shape[:2]
+      numPlayers = self.numPlayers
+      if(maps.shape not in self.scratch):
+         self.scratch[maps.shape] = np.empty(maps.shape[:3], dtype=bool)
+      structure = self.scratch[maps.shape]
+      #Players in order from the acting player, for each batch element
+      order = (np.asarray(player).reshape(-1, 1) + np.arange(numPlayers)) % numPlayers
+      order = np.broadcast_to(order, (batchSize, numPlayers))
+
+      np.multiply(maps[:, :, :, 0], self.haliteScale, out=planes[:, 0])
+      #Layer 1 holds the structure's halite on Factories/Dropoffs, where ships carry nothing
+      np.not_equal(maps[:, :, :, 2], 0, out=structure)
+      np.multiply(maps[:, :, :, 1], self.haliteScale, out=planes[:, 1])
+      np.copyto(planes[:, 1], 0, where=structure)
+      np.copyto(planes[:, 2], maps[:, :, :, 3])
+      np.equal(maps[:, :, :, 2], 1, out=planes[:, 3])
+      np.equal(maps[:, :, :, 2], -1, out=planes[:, 4])
+      halite = np.take_along_axis(playerHalite, order, axis=1) * self.bankScale
+      for k in range(0, numPlayers):
+         np.equal(maps[:, :, :, 4], (order[:, k] + 1)[:, None, None], out=planes[:, 5 + k])
+         planes[:, 5 + numPlayers + k] = halite[:, k, None, None]
+         if(self.distances):
+            if(np.ndim(player) == 0):
+               np.multiply(maps[:, :, :, 5 + order[0, k]], 1.0 / mapSize, out=planes[:, 5 + 2 * numPlayers + k])
+            else:
+               #One layer per batch element, written one by one as fancy indexing would copy them
+               for i in range(0, batchSize):
+                  np.multiply(maps[i, :, :, 5 + order[i, k]], 1.0 / mapSize, out=planes[i, 5 + 2 * numPlayers + k])
+      return out
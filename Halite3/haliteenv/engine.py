@@ -0,0 +1,658 @@
+import os
+import warnings
+from collections import OrderedDict
+import numpy as np
+from enum import Enum
+from haliteenv.constants import Constants
+from haliteenv import kernels
+from haliteenv.state import CompactState
+from haliteenv.delta import DeltaTracker
+from haliteenv.snapshot import EnvState
+from haliteenv.replay import ReplayWriter
+from haliteenv.profiling import StepProfiler
+from haliteenv.rendering import rgbFrame
+
+class HaliteEngine:
+   """
+   Stores a Halite III game and plays it, without gym or any plotting library (NumPy only), so
+   headless workers start fast. HaliteEnv wraps it as an OpenAI gym environment.
+   This does not use Halite III's actual game engine
+   (which analyzes input from terminal and is slow for RL) but instead is
+   a replica in Python.
+   
+   Attributes:
+   -----------
+   self.map : np.ndarray
+      Map of game as a 3D array. Stores different information on each "layer"
+      of the array.
+      Layer 0: The Halite currently on the sea floor
+      Layer 1: The Halite currently on ships/factory/dropoff
+      Layer 2: Whether a Factory or Dropoff exists at the layer (Factory is 1, Dropoff is -1)
+      Layer 3: Whether a Ship exists at the layer
+      Layer 4: Ownership
+      Layer 5: Whether the ship at the layer is inspired (not given as part of observation by default)
+   
+   self.mapSize : int
+      Size of map (for x and y)
+
+   self.numPlayers : int
+      Number of players
+
+   self.playerHalite : np.ndarray
+      Stores the total halite a player with ownership id <index + 1> has. self.map also stores the total halite 
+      with the halite under factories/dropoffs, but doesn't include the 5000 initial.
+
+   self.turn : int
+      Number of turns played since the last reset
+
+   self.maxTurns : int
+      Number of turns in a game, which depends on the map size (see kernels.episodeLength)
+
+   self.profiler : StepProfiler
+      Profiler timing the phases of every step (None when not profiling)
+
+   self.random : np.random.Generator
+      Random generator of the environment (see <seed> in __init__)
+
+   self.turnKernel : function
+      Compiled function playing whole turns (see compiled.playTurn), or None to use the NumPy kernels
+
+   self.dropoffDistance : np.ndarray
+      Distance (in moves, wrapping around the map) from every cell to the closest Factory or
+      Dropoff of each player, shape (numPlayers, mapSize, mapSize) (int32). It's only updated
+      when a Dropoff is built, so reading it costs nothing.
+   """
+   metadata = {'render_modes':['rgb_array'], 'map_size':0, 'num_players':0}
+   
+   def __init__(self, numPlayers, mapType, mapSize, regenMapOnReset = False, mapSeeds = None, mapCache = None, deltaObservations = False, profiler = None, distanceObservations = False, compiled = False, seed = None):
+      """
+      HaliteEngine initialization function.
+
+      Parameters:
+      -----------
+      mapSeeds : list
+         Seeds of the maps to play. Each map generated (at initialization, then on every reset
+         if <regenMapOnReset>) is the next seed in the list, wrapping back to the start.
+         If None, maps are random.
+      mapCache : MapCache
+         Cache seeded maps are taken from (defaultMapCache if None)
+      deltaObservations : bool
+         If True, step() returns an ObservationDelta of what changed since the last step instead
+         of the full map (see step)
+      profiler : StepProfiler or bool
+         Profiler to time every step with (see StepProfiler). True creates one.
+      distanceObservations : bool
+         If True, <dropoffDistance> is added to the observed map as <numPlayers> more layers
+         (see step). Can't be used with <deltaObservations>.
+      compiled : bool
+         If True, every turn is played by the Numba-compiled loop of haliteenv.compiled instead of
+         the NumPy kernels, which is faster for one game at a time. Without Numba installed it
+         warns and uses the NumPy kernels.
+      seed : int or np.random.SeedSequence
+         Seed of the environment's random generator, which draws the unseeded maps (see
+         <mapSeeds>). Environments with the same seed generate the same maps. Seeds for many
+         environments can be split off one with spawnSeeds(). If None, it's seeded randomly.
+      """
+      assert not (deltaObservations and distanceObservations), "Delta observations only hold the 5 map layers"
+      print("Initializing Halite Environment")
+      self.numPlayers = numPlayers
+      self.mapSize = mapSize.value
+      self.mapSeeds = mapSeeds
+      self.mapCache = defaultMapCache if mapCache is None else mapCache
+      self.mapIndex = 0
+      self.random = np.random.default_rng(seed)
+      self.map = self.generateMap()
+      
+      self.playerHalite = np.empty((numPlayers, 1))
+      self.playerHalite.fill(Constants.INITIAL_ENERGY)
+      self.regenMap = regenMapOnReset
+      self.turn = 0
+      self.maxTurns = kernels.episodeLength(self.mapSize)
+      self.deltaTracker = DeltaTracker(self.mapSize) if deltaObservations else None
+      self.replay = None
+      self.profiler = StepProfiler() if profiler is True else (profiler or None)
+      self.distanceObservations = distanceObservations
+      self.turnKernel = None
+      if(compiled):
+         from haliteenv.compiled import AVAILABLE, playTurn
+         if(AVAILABLE):
+            self.turnKernel = playTurn
+         else:
+            warnings.warn("Numba isn't installed, compiled=True falls back to the NumPy kernels")
+      self.dropoffDistance = np.empty((numPlayers, self.mapSize, self.mapSize), dtype=np.int32)
+      self.updateDropoffDistance()
+      self.metadata['map_size'] = mapSize.value
+      self.metadata['num_players'] = numPlayers
+      if(not self.regenMap):
+         self.originalMap = self.map.copy()
+         self.originalDropoffDistance = self.dropoffDistance.copy()
+   
+   def step(self, action):
+      """
+      Step of Halite III environment
+      
+      Parameters:
+      -----------
+      action : np.ndarray or list
+         Array of length <numPlayers> where each element is an action for the player
+         whose id is (index + 1). Shape is (mapSize, mapSize, numPlayers).
+         Each player's actions are represented as a 2D array the size of the map, where
+         each element is what move to do on an element of the map. This means that many extra/
+         illegal moves are made, which are ignored during the step.
+         
+         Why 2D? I couldn't think of a different way to represent the full action space.
+         I'm open for suggestions (create an issue on the Github if you have any).
+
+         Actions can also be given sparsely, as a list of <numPlayers> arrays of shape (N, 2)
+         where each row is (cell, move) with cell = y * mapSize + x (the ship id of CompactState).
+         Cells left out Do Nothing. Dense actions are converted to this form internally.
+         
+         Moves possible:
+            0 - Do Nothing
+            1 - Spawn ship
+            2 - Convert to dropoff
+            3 - Move N
+            4 - Move E
+            5 - Move S
+            6 - Move W
+      
+      Returns:
+      --------
+      ob, reward, episode_over, info : tuple
+         ob (array):
+            Game observation as an sequence (<map>, <playerHalite>)
+            With <distanceObservations>, <map> has <numPlayers> more layers after the first 5:
+            layer 5 + i is the distance to the closest Factory/Dropoff of ownership id i + 1.
+            With <deltaObservations>, <map> is an ObservationDelta of the changes since the last
+            step (the first one after a reset is relative to an empty map). A DeltaTracker's
+            apply() and materialize() rebuild the full map from them.
+         reward (array):
+            Reward for each player with ownership id <index + 1> for action taken. On the last
+            turn the players also get a reward for their rank (see kernels.terminalRewards).
+         episode_over (bool)
+            Whether or not game is over (after <maxTurns> turns).
+         info (dict)
+            Info for debugging: the turn just played, and the ownership ids of the winners
+            once the game is over.
+      """
+      assert self.turn < self.maxTurns, "The game is over, call reset()"
+      profiler = self.profiler
+      if(profiler is not None):
+         profiler.start()
+      #Process turns first
+      #Every ship's action is gathered before any of them are carried out, then moves, collisions
+      #and deposits are settled together (like the Halite game engine does) so the order ships
+      #are found in doesn't matter
+      if(isinstance(action, np.ndarray)):
+         actions = kernels.sparseActions(action[None])
+      else:
+         actions = self.sparseActions(action)
+      keys, commands = actions
+      if(self.turnKernel is not None):
+         #The whole turn, inspiration and extraction included, in one call
+         invalid = self.turnKernel(self.map, self.playerHalite.reshape(-1), keys, commands, kernels.neighborTable(self.mapSize),
+                                   kernels.radiusTable(self.mapSize, Constants.INSPIRATION_RADIUS))
+         if(profiler is not None):
+            profiler.lap('moves')
+            profiler.count('invalid', invalid.sum())
+      else:
+         invalid = kernels.resolveTurn(self.map[None], self.playerHalite.T, actions, profiler)[0]
+      #Only cells told to convert can have become Dropoffs, and those already in the field aren't new
+      y, x = np.divmod(keys[commands == 2] // self.numPlayers, self.mapSize)
+      y, x = y[self.map[y, x, 2] == -1], x[self.map[y, x, 2] == -1]
+      owner = self.map[y, x, 4].astype(np.int64) - 1
+      built = self.dropoffDistance[owner, y, x] != 0
+      for player, cell in zip(owner[built], y[built] * self.mapSize + x[built]):
+         kernels.addDistanceSource(self.dropoffDistance[player], cell, self.mapSize)
+      #Deinceventize outright bad/invalid moves
+      playerReward = -0.1 * invalid
+
+      if(self.turnKernel is None):
+         #Update inspiration for the whole map at once, then extraction
+         inspired = kernels.inspirationMap(self.map[None], self.numPlayers)
+         self.map[:, :, 5] = inspired[0]
+         if(profiler is not None):
+            profiler.lap('inspiration')
+         kernels.extractHalite(self.map[None], inspired)
+         if(profiler is not None):
+            profiler.lap('extraction')
+      #Capture is currently disabled according to constants, so not adding it
+      playerReward += self.playerHalite[:, 0] * 0.0005
+      self.turn += 1
+      episodeOver = self.turn >= self.maxTurns
+      info = {'turn':self.turn}
+      if(episodeOver):
+         playerReward += kernels.terminalRewards(self.playerHalite.T)[0]
+         info['winners'] = np.flatnonzero(self.playerHalite[:, 0] == self.playerHalite.max()) + 1
+      if(self.replay is not None):
+         self.replay.record(self.map[:, :, :5], self.playerHalite, actions, playerReward)
+      
+      ob = self.observation()
+      if(profiler is not None):
+         profiler.lap('other')
+         profiler.finish()
+      return (ob, playerReward, episodeOver, info)
+
+   def observation(self):
+      """
+      Current observation (<map>, <playerHalite>) as step() returns it.
+      """
+      if(self.deltaTracker is not None):
+         return (self.deltaTracker.diff(self.map[:, :, :5]), self.playerHalite.copy())
+      if(self.distanceObservations):
+         return (np.concatenate((self.map[:, :, :5], self.dropoffDistance.transpose(1, 2, 0)), axis=2), self.playerHalite)
+      return (self.map[:, :, :5], self.playerHalite)
+
+   def updateDropoffDistance(self):
+      """
+      Works out <dropoffDistance> from scratch.
+      """
+      owners = np.arange(1, self.numPlayers + 1)[:, None, None]
+      structures = (self.map[None, :, :, 2] != 0) & (self.map[None, :, :, 4] == owners)
+      self.dropoffDistance[:] = kernels.distanceField(structures, self.mapSize)
+   
+   def render(self, mode = 'rgb_array'):
+      """
+      Returns the map as an RGB image (see rendering.rgbFrame), cheap enough for every turn.
+      FrameRenderer and rendering.exportVideo render whole games without a display.
+      """
+      assert mode == 'rgb_array', "HaliteEngine only renders 'rgb_array' (HaliteEnv also renders 'human')"
+      return rgbFrame(self.map, 8)
+
+   def reset(self):
+      """
+      Resets the game. If <regenMapOnReset> in __init__() is True, it regenerates the map. 
+      Otherwise, it just replaces the used map with a copy of the original.
+      A replay being recorded is closed, as it only holds one game (to record every game
+      played by runEpisodes, pass it a replayPath).
+      The new game is copied into the existing arrays, so views of them stay valid.
+
+      Returns:
+      --------
+      ob : tuple
+         Observation of the new game, like step() returns it
+      """
+      self.stopReplay()
+      if(not self.regenMap):
+         np.copyto(self.map, self.originalMap)
+         np.copyto(self.dropoffDistance, self.originalDropoffDistance)
+      else:
+         np.copyto(self.map, self.generateMap())
+         self.updateDropoffDistance()
+      self.playerHalite.fill(Constants.INITIAL_ENERGY)
+      self.turn = 0
+      if(self.deltaTracker is not None):
+         self.deltaTracker.reset()
+      return self.observation()
+
+   def runEpisodes(self, n, policies, replayPath = None):
+      """
+      Plays <n> complete games back to back, resetting between them.
+
+      Parameters:
+      -----------
+      n : int
+         Number of games
+      policies : list
+         A function per player, called as policies[i](ob, i) with the observation from step().
+         It returns player i's actions: a (mapSize, mapSize) array of moves, or an (N, 2) array
+         of (cell, move) rows (see step).
+      replayPath : str
+         If given, each game is recorded to its own replay file (see startReplay), named
+         replayPath.format(episode), e.g. 'replays/game{:03d}.hlr'
+
+      Returns:
+      --------
+      totalReward, finalHalite : tuple
+         Sum of each player's rewards and each player's halite at the end, shape (n, numPlayers)
+      """
+      totalReward = np.zeros((n, self.numPlayers))
+      finalHalite = np.zeros((n, self.numPlayers))
+      dense = np.zeros((self.mapSize, self.mapSize, self.numPlayers), dtype=np.int64)
+      for episode in range(0, n):
+         ob = self.reset()
+         if(replayPath is not None):
+            self.startReplay(replayPath.format(episode))
+         episodeOver = False
+         while not episodeOver:
+            playerActions = [np.asarray(policy(ob, player)) for player, policy in enumerate(policies)]
+            if(all([actions.shape == dense.shape[:2] for actions in playerActions])):
+               for player, actions in enumerate(playerActions):
+                  dense[:, :, player] = actions
+               action = dense
+            else:
+               action = [np.stack([np.flatnonzero(actions), actions.reshape(-1)[np.flatnonzero(actions)]], axis=1)
+                         if actions.shape == dense.shape[:2] else actions for actions in playerActions]
+            ob, reward, episodeOver, info = self.step(action)
+            totalReward[episode] += reward
+         finalHalite[episode] = self.playerHalite[:, 0]
+         self.stopReplay()
+      return totalReward, finalHalite
+
+   def startReplay(self, path, keyframeInterval = 50):
+      """
+      Starts recording the game to a replay file (see ReplayWriter), beginning with the current
+      state. Every step() is recorded until stopReplay() or reset(). ReplayReader reads it back.
+      """
+      self.stopReplay()
+      self.replay = ReplayWriter(path, self.mapSize, self.numPlayers, keyframeInterval)
+      self.replay.record(self.map[:, :, :5], self.playerHalite)
+
+   def stopReplay(self):
+      """
+      Finishes the replay being recorded, if any.
+      """
+      if(self.replay is not None):
+         self.replay.close()
+         self.replay = None
+
+   def materialize(self):
+      """
+      Copy of the full current observation (<map>, <playerHalite>), in either observation mode.
+      """
+      return (self.map[:, :, :5].copy(), self.playerHalite.copy())
+
+   def sparseActions(self, playerActions):
+      """
+      Converts per-player (cell, move) arrays (see step) into the sparse actions of the kernels.
+      Cells off the map are dropped: nothing is there to act, like on empty cells.
+      """
+      playerActions = [np.asarray(actions, dtype=np.int64).reshape(-1, 2) for actions in playerActions]
+      player = np.repeat(np.arange(len(playerActions)), [len(actions) for actions in playerActions])
+      actions = np.concatenate(playerActions)
+      onMap = (actions[:, 0] >= 0) & (actions[:, 0] < self.mapSize * self.mapSize)
+      player, actions = player[onMap], actions[onMap]
+      return kernels.sparseActionsFromLists(np.zeros_like(player), player, actions[:, 0], actions[:, 1], self.mapSize, self.numPlayers)
+
+   def getState(self, pool = None):
+      """
+      Saves the current state, e.g. to branch off from it in tree search.
+
+      Parameters:
+      -----------
+      pool : StatePool
+         Pool to take the buffers from (new arrays are allocated if None)
+
+      Returns:
+      --------
+      state : EnvState
+      """
+      state = EnvState(np.empty_like(self.map), np.empty_like(self.playerHalite)) if pool is None else pool.acquire()
+      np.copyto(state.map, self.map)
+      np.copyto(state.playerHalite, self.playerHalite)
+      state.turn = self.turn
+      return state
+
+   def setState(self, state):
+      """
+      Restores a state saved with getState(). It is copied into the environment's own arrays,
+      so nothing is allocated and <state> can be restored again later.
+      """
+      changedStructures = not np.array_equal(self.map[:, :, 2], state.map[:, :, 2])
+      np.copyto(self.map, state.map)
+      np.copyto(self.playerHalite, state.playerHalite)
+      self.turn = state.turn
+      if(changedStructures):
+         self.updateDropoffDistance()
+
+   def compactState(self):
+      """
+      Compact copy of the current state (see CompactState), for storing many states.
+      CompactState.toMap() rebuilds self.map and self.playerHalite from it.
+      """
+      return CompactState(self.map, self.playerHalite)
+
+   def generateMap(self):
+      """
+      Generates the map of the next game, taking it from the map cache if it is seeded.
+      """
+      if(self.mapSeeds is None):
+         return Map.generateFractalMap(self.mapSize, self.numPlayers, random=self.random)
+      seed = self.mapSeeds[self.mapIndex % len(self.mapSeeds)]
+      self.mapIndex += 1
+      return self.mapCache.get(seed, self.mapSize, self.numPlayers)
+
+class MapType(Enum):
+   """
+   Enum of the different map types
+   """
+   BASIC = 0
+   FRACTAL = 1
+   BLUR = 2
+class MapSize(Enum):
+   """
+   Enum of the different possible map sizes
+   """
+   TINY = 32
+   SMALL = 40
+   MEDIUM = 48
+   LARGE = 56
+   GIANT = 64
+
+class Map:
+   """
+   Class that holds the map-generation functions
+   """
+   def generateBasicMap(mapSize):
+      """
+      Generates a basic map (a map with all cells having 10 halite)
+      TODO: Complete function to include factories and players
+      """
+      #Default halite value is 10 before transformations
+      map = np.empty((mapSize, mapSize, 3))
+      map[:, :, 0].fill(10)
+      return map
+   
+   def generateBlurMap(mapSize):
+      """
+      Stub of future generator for a blur-style map
+      """
+      print("Blur")
+   
+   def generateSmoothNoise(sourceNoise, wavelength):
+      """
+      Helper function for generateFractalMap. Generates smoothed noise for fractals by
+      sampling every <wavelength>th cell and blending them back up to full size (bilinear,
+      wrapping around the edges). Done for every cell at once.
+      """
+      miniSource = sourceNoise[::wavelength, ::wavelength]
+      y = np.arange(sourceNoise.shape[0])
+      yI = y // wavelength
+      yF = (yI + 1) % miniSource.shape[0]
+      verticalBlend = (y / float(wavelength) - yI)[:, None]
+      x = np.arange(sourceNoise.shape[1])
+      xI = x // wavelength
+      xF = (xI + 1) % miniSource.shape[1]
+      horizontalBlend = x / float(wavelength) - xI
+      topBlend = (1 - horizontalBlend) * miniSource[yI][:, xI] + horizontalBlend * miniSource[yI][:, xF]
+      bottomBlend = (1 - horizontalBlend) * miniSource[yF][:, xI] + horizontalBlend * miniSource[yF][:, xF]
+      return (1 - verticalBlend) * topBlend + verticalBlend * bottomBlend
+   
+   def generateFractalMap(mapSize, numPlayers, seed = None, random = None):
+      """
+      Generates fractal-based map
+
+      Parameters:
+      -----------
+      mapSize : int
+         Size of map (for x and y)
+      numPlayers : int
+         Number of players
+      seed : int
+         Seed of the map. The same seed, size and number of players always gives the same map.
+      random : np.random.Generator
+         Generator to draw the map from when there is no <seed> (a new, unseeded one if None)
+      """
+      if(seed is not None):
+         #Seeded maps stay what they have always been (and what MapCache files hold)
+         random = np.random.RandomState(seed)
+         randint = random.randint
+      else:
+         random = np.random.default_rng() if random is None else random
+         randint = random.integers
+      numTiles = 1
+      numTileRows = 1
+      numTileCols = 1
+      while numTiles < numPlayers:
+         numTileCols *= 2
+         numTiles *= 2
+         if numTiles == numPlayers:
+            break
+         numTileRows *= 2
+         numTiles *= 2
+      tileWidth = int(mapSize / numTileCols)
+      tileHeight = int(mapSize / numTileRows)
+      sourceNoise = np.square(random.uniform(0.0, 1.0, (tileHeight, tileWidth)))
+      region = np.zeros((tileHeight, tileWidth))
+      maxOctave = np.floor(np.log2(min(tileHeight, tileWidth))) + 1
+      amplitude = 1.0
+      for octave in np.arange(2, maxOctave + 1, 1):# range(2, maxOctave + 1):
+         smoothedSource = Map.generateSmoothNoise(sourceNoise, int(round(pow(2, maxOctave - octave))))
+         region += amplitude * smoothedSource
+         amplitude *= Constants.PERSISTENCE
+      region = np.square(region)
+      maxCellProduction = randint(0, 7296) % (1 + Constants.MAX_CELL_PRODUCTION - Constants.MIN_CELL_PRODUCTION) + Constants.MIN_CELL_PRODUCTION
+      region *= maxCellProduction / region.max()
+      tile = np.empty((tileHeight, tileWidth, 6))
+      #Halite on floor
+      tile[:, :, 0] = np.round(region)
+      #Halite on ships
+      tile[:, :, 1].fill(0)
+      #Factories
+      tile[:, :, 2].fill(0)
+      #Ships
+      tile[:, :, 3].fill(0)
+      #Ownership
+      tile[:, :, 4].fill(0)
+      #Inspiration
+      tile[:, :, 5].fill(0)
+      
+      factoryX = int(tileWidth / 2)
+      factoryY = int(tileHeight / 2)
+      if tileWidth >= 16 and tileWidth <= 40 and tileHeight >= 16 and tileHeight <= 40:
+         factoryX = int(8 + ((tileWidth - 16) / 24.0) * 20)
+         if numPlayers > 2:
+            factoryY = int(8 + ((tileHeight - 16) / 24.0) * 20)
+      tile[factoryY, factoryX, 0] = 0
+      tile[factoryY, factoryX, 2] = 1
+      tile[factoryY, factoryX, 4] = 1
+      currentWidth = tileWidth
+      currentHeight = tileHeight
+      numTiles = 1
+      while numTiles < numPlayers:
+         #Flipping over vertical line
+         flip = np.fliplr(tile)
+         tile = np.concatenate((tile, flip), axis=1)
+         currentWidth *= 2
+         numTiles *= 2
+         if numTiles == numPlayers:
+            break
+         #Flipping over horizontal line
+         flip = np.flipud(tile)
+         tile = np.concatenate((tile, flip), axis=0)
+         currentHeight *= 2
+         numTiles *= 2
+      playerNum = 1
+      for i in range(1, int(currentWidth / tileWidth) + 1):
+         for j in range(1, int(currentHeight / tileHeight) + 1):
+            tile[((j - 1) * tileHeight):(j * tileHeight), ((i - 1) * tileWidth):(i * tileWidth), 4] *= playerNum
+            playerNum += 1
+      return tile
+
+class MapCache:
+   """
+   Cache of generated fractal maps keyed by (seed, mapSize, numPlayers), so a fixed pool
+   of maps can be replayed without generating them again on every reset.
+
+   Attributes:
+   -----------
+   self.maxMaps : int
+      Number of maps kept in memory. When full, the least recently used map is evicted.
+
+   self.directory : str
+      Directory maps are also saved to/loaded from as .npy files (None to keep them in memory only).
+      Files on disk are never evicted.
+
+   self.maps : OrderedDict
+      Maps in memory, least recently used first
+   """
+   def __init__(self, maxMaps = 256, directory = None):
+      """
+      MapCache initialization function.
+      """
+      self.maxMaps = maxMaps
+      self.directory = directory
+      self.maps = OrderedDict()
+      if(directory is not None):
+         os.makedirs(directory, exist_ok=True)
+
+   def get(self, seed, mapSize, numPlayers):
+      """
+      Gets the map generated by Map.generateFractalMap(mapSize, numPlayers, seed), from memory,
+      from disk or by generating it.
+
+      Parameters:
+      -----------
+      seed : int
+         Seed of the map
+      mapSize : int
+         Size of map (for x and y)
+      numPlayers : int
+         Number of players
+
+      Returns:
+      --------
+      map : np.ndarray
+         Copy of the map (changing it doesn't change the cache)
+      """
+      key = (seed, mapSize, numPlayers)
+      if(key in self.maps):
+         self.maps.move_to_end(key)
+         return self.maps[key].copy()
+      path = None
+      if(self.directory is not None):
+         path = os.path.join(self.directory, "fractal_%d_%d_%d.npy" % (mapSize, numPlayers, seed))
+      if(path is not None and os.path.exists(path)):
+         map = np.load(path)
+      else:
+         map = Map.generateFractalMap(mapSize, numPlayers, seed)
+         if(path is not None):
+            #Write to a temporary file first so other processes never load half a map
+            tempPath = path + ".%d.tmp.npy" % os.getpid()
+            np.save(tempPath, map)
+            os.replace(tempPath, path)
+      self.maps[key] = map
+      if(len(self.maps) > self.maxMaps):
+         self.maps.popitem(last=False)
+      return map.copy()
+
+   def clear(self):
+      """
+      Empties the in-memory cache (files on disk are kept).
+      """
+      self.maps.clear()
+
+#Cache shared by every environment in the process that isn't given its own
+defaultMapCache = MapCache()
+
+def spawnSeeds(seed, n):
+   """
+   Splits <seed> into <n> independent seeds (see np.random.SeedSequence.spawn), e.g. one per game
+   of a batch or worker. With an int seed, stream i only depends on <seed> and i, so a game gets
+   the same maps whether it's played alone, in a batch or in a worker process (spawning from the
+   same SeedSequence again gives new streams).
+
+   Parameters:
+   -----------
+   seed : int or np.random.SeedSequence
+      Seed to split (seeded randomly if None)
+   n : int
+      Number of seeds
+
+   Returns:
+   --------
+   seeds : list
+      <n> np.random.SeedSequence
+   """
+   sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+   return sequence.spawn(n)
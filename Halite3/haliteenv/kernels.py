@@ -0,0 +1,559 @@
+import numpy as np
+from haliteenv.constants import Constants
+
+#(dy, dx) offsets for moves 3 - 6 (N, E, S, W)
+MOVE_OFFSETS = np.array([[-1, 0], [0, 1], [1, 0], [0, -1]])
+
+#Index tables of each map size, built the first time they're needed
+NEIGHBOR_TABLES = {}
+RADIUS_TABLES = {}
+DISTANCE_TABLES = {}
+
+#Reward added on the last turn of a game, + for the winner(s) and - for the last player(s).
+#A player holding 5000 halite earns about this much reward every 40 turns
+TERMINAL_REWARD = 100.0
+
+def neighborTable(mapSize):
+   """
+   Neighbors of every cell on a <mapSize> map, which wraps around at the edges.
+
+   Returns:
+   --------
+   table : np.ndarray
+      Array of shape (mapSize * mapSize, 5) where table[cell] is the cell itself followed by
+      the cells N, E, S and W of it (cell = y * mapSize + x). Column <move - 2> is where
+      move 3 - 6 leads, so the destinations of a whole fleet are a single gather.
+   """
+   if(mapSize not in NEIGHBOR_TABLES):
+      y, x = np.divmod(np.arange(mapSize * mapSize), mapSize)
+      offsets = np.concatenate([[[0, 0]], MOVE_OFFSETS])
+      table = ((y[:, None] + offsets[:, 0]) % mapSize) * mapSize + (x[:, None] + offsets[:, 1]) % mapSize
+      NEIGHBOR_TABLES[mapSize] = table
+   return NEIGHBOR_TABLES[mapSize]
+
+def radiusTable(mapSize, radius):
+   """
+   Cells within Manhattan distance <radius> of every cell on a <mapSize> map (wrapping).
+
+   Returns:
+   --------
+   table : np.ndarray
+      Array of shape (mapSize * mapSize, 2 * radius * (radius + 1) + 1) of cells
+   """
+   if((mapSize, radius) not in RADIUS_TABLES):
+      offsets = np.array([(dy, dx) for dy in range(-radius, radius + 1) for dx in range(abs(dy) - radius, radius - abs(dy) + 1)])
+      y, x = np.divmod(np.arange(mapSize * mapSize), mapSize)
+      table = ((y[:, None] + offsets[:, 0]) % mapSize) * mapSize + (x[:, None] + offsets[:, 1]) % mapSize
+      RADIUS_TABLES[(mapSize, radius)] = table
+   return RADIUS_TABLES[(mapSize, radius)]
+
+def distanceTable(mapSize):
+   """
+   Distance between every two coordinates along one axis of a <mapSize> map, which wraps around.
+
+   Returns:
+   --------
+   table : np.ndarray
+      Array of shape (mapSize, mapSize) (int32), where table[i, j] is the distance from i to j
+   """
+   if(mapSize not in DISTANCE_TABLES):
+      offset = np.abs(np.arange(mapSize)[:, None] - np.arange(mapSize)[None, :])
+      DISTANCE_TABLES[mapSize] = np.minimum(offset, mapSize - offset).astype(np.int32)
+   return DISTANCE_TABLES[mapSize]
+
+def cellDistance(a, b, mapSize):
+   """
+   Distance (in moves, wrapping around the map) between cells <a> and <b> (cell = y * mapSize + x),
+   broadcasting like any NumPy operation.
+   """
+   ay, ax = np.divmod(a, mapSize)
+   by, bx = np.divmod(b, mapSize)
+   table = distanceTable(mapSize)
+   return table[ay, by] + table[ax, bx]
+
+def distanceField(sources, mapSize):
+   """
+   Distance (in moves, wrapping around the map) from every cell to the closest source cell.
+
+   Parameters:
+   -----------
+   sources : np.ndarray
+      Boolean array of shape (..., mapSize, mapSize), True on source cells
+   mapSize : int
+      Size of map (for x and y)
+
+   Returns:
+   --------
+   distance : np.ndarray
+      Array of the same shape as <sources> (int32). Where there are no sources it's
+      mapSize * mapSize (further than any cell can be).
+   """
+   numCells = mapSize * mapSize
+   flat = sources.reshape(-1, numCells)
+   distance = np.full(flat.shape, numCells, dtype=np.int32)
+   field, cell = np.divmod(np.flatnonzero(flat), numCells)
+   if(len(cell)):
+      #Distance from every source to every cell, lined up by field, then the closest of each
+      table = distanceTable(mapSize)
+      y, x = np.divmod(cell, mapSize)
+      hasSources, first, counts = np.unique(field, return_index=True, return_counts=True)
+      toSource = np.full((len(hasSources), counts.max(), mapSize, mapSize), numCells, dtype=np.int32)
+      toSource[np.repeat(np.arange(len(hasSources)), counts), np.arange(len(cell)) - np.repeat(first, counts)] = table[y][:, :, None] + table[x][:, None, :]
+      distance[hasSources] = toSource.min(axis=1).reshape(len(hasSources), numCells)
+   return distance.reshape(sources.shape)
+
+def addDistanceSource(distance, cell, mapSize):
+   """
+   Updates a distance field (see distanceField) in place for a new source at <cell>, which
+   can only bring cells closer. Adding a source that is already there changes nothing.
+
+   Parameters:
+   -----------
+   distance : np.ndarray
+      Distance field of shape (mapSize, mapSize)
+   cell : int
+      New source (cell = y * mapSize + x)
+   mapSize : int
+      Size of map (for x and y)
+   """
+   table = distanceTable(mapSize)
+   y, x = divmod(int(cell), mapSize)
+   np.minimum(distance, table[y][:, None] + table[x][None, :], out=distance)
+
+def sparseActions(actions):
+   """
+   Converts dense actions of shape (numGames, mapSize, mapSize, numPlayers) into the sparse
+   form the kernels use: (keys, commands) of every non-zero action, where
+   key = (game * mapSize * mapSize + cell) * numPlayers + player and cell = y * mapSize + x.
+   The key is just the index into the flattened dense array, so they come out sorted.
+
+   Parameters:
+   -----------
+   actions : np.ndarray
+      Actions of shape (numGames, mapSize, mapSize, numPlayers)
+
+   Returns:
+   --------
+   keys, commands : tuple
+      Sorted keys and the command (1 - 6) for each
+   """
+   keys = np.flatnonzero(actions)
+   return keys, actions.reshape(-1)[keys].astype(np.int64)
+
+def sparseActionsFromLists(game, player, cell, command, mapSize, numPlayers):
+   """
+   Builds sparse actions (see sparseActions) out of parallel arrays, e.g. one entry per ship
+   from a policy that acts per ship. If a cell is given more than once for a player, the
+   first command is used.
+
+   Parameters:
+   -----------
+   game, player, cell, command : np.ndarray
+      Game index, player index (ownership id - 1), cell index (y * mapSize + x) and command
+      of every action
+   mapSize : int
+      Size of map (for x and y)
+   numPlayers : int
+      Number of players
+
+   Returns:
+   --------
+   keys, commands : tuple
+      Sorted keys and the command for each
+   """
+   keys = (np.asarray(game, dtype=np.int64) * mapSize * mapSize + np.asarray(cell, dtype=np.int64)) * numPlayers + np.asarray(player, dtype=np.int64)
+   order = np.argsort(keys, kind='stable')
+   return keys[order], np.asarray(command, dtype=np.int64)[order]
+
+def keyCounts(keys):
+   """
+   How many times each element of <keys> appears in <keys>. Sorting the keys keeps the cost
+   down to the number of keys, rather than the range they come from.
+   """
+   unique, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+   return counts[inverse]
+
+def lookupActions(actions, keys):
+   """
+   Looks up the command of every key in sparse <actions> (0 - Do Nothing if it isn't there).
+   """
+   actionKeys, commands = actions
+   if(len(actionKeys) == 0):
+      return np.zeros(len(keys), dtype=np.int64)
+   index = np.minimum(np.searchsorted(actionKeys, keys), len(actionKeys) - 1)
+   return np.where(actionKeys[index] == keys, commands[index], 0)
+
+def affordable(keys, costs, budget):
+   """
+   Works out which purchases can be paid for. Purchases are paid for in the order given,
+   each player paying out of their own budget, and once a player runs out every later
+   purchase of theirs is rejected (this keeps it a single cumulative sum).
+
+   Parameters:
+   -----------
+   keys : np.ndarray
+      Flat player index (game * numPlayers + player) of each purchase
+   costs : np.ndarray
+      Cost of each purchase
+   budget : np.ndarray
+      Flat array of how much halite each player has
+
+   Returns:
+   --------
+   mask : np.ndarray
+      Whether each purchase was paid for
+   """
+   mask = np.zeros(len(keys), dtype=bool)
+   if(len(keys) == 0):
+      return mask
+   order = np.argsort(keys, kind='stable')
+   sortedKeys = keys[order]
+   sortedCosts = costs[order]
+   running = np.cumsum(sortedCosts)
+   #Restart the running total at the first purchase of every player
+   starts = np.flatnonzero(np.r_[True, sortedKeys[1:] != sortedKeys[:-1]])
+   groupStart = np.repeat(starts, np.diff(np.r_[starts, len(keys)]))
+   running -= running[groupStart] - sortedCosts[groupStart]
+   mask[order] = running <= budget[sortedKeys]
+   return mask
+
+def constructDropoffs(maps, playerHalite, b, y, x, player, act):
+   """
+   Converts every ship that asked for it (action 2) into a Dropoff.
+
+   Parameters:
+   -----------
+   maps : np.ndarray
+      Maps of shape (numGames, mapSize, mapSize, 6), modified in place
+   playerHalite : np.ndarray
+      Halite of each player, shape (numGames, numPlayers), modified in place
+   b, y, x : np.ndarray
+      Game, Y and X of every ship
+   player : np.ndarray
+      Flat player index (game * numPlayers + owner - 1) of every ship
+   act : np.ndarray
+      Action given to every ship
+
+   Returns:
+   --------
+   converted, failed : tuple
+      Masks over the ships that became Dropoffs and that failed to
+   """
+   converted = act == 2
+   cb, cy, cx = b[converted], y[converted], x[converted]
+   #There is already a dropoff/factory here, don't recreate
+   ok = maps[cb, cy, cx, 2] == 0
+   cost = Constants.DROPOFF_COST - maps[cb, cy, cx, 0]
+   ok[ok] = affordable(player[converted][ok], cost[ok], playerHalite.ravel())
+   failed = np.zeros_like(converted)
+   failed[converted] = ~ok
+   converted[converted] = ok
+   cb, cy, cx = b[converted], y[converted], x[converted]
+   playerHalite -= np.bincount(player[converted], cost[ok], playerHalite.size).reshape(playerHalite.shape)
+   maps[cb, cy, cx, 3] = 0
+   maps[cb, cy, cx, 2] = -1
+   maps[cb, cy, cx, 0] = 0
+   return converted, failed
+
+def moveShips(maps, playerHalite, b, y, x, owner, act):
+   """
+   Moves every ship at once. All destinations are gathered first and then settled together,
+   so the outcome doesn't depend on the order ships are listed in:
+      - Moves without enough halite for the move cost or onto an enemy Factory/Dropoff fail
+        and the ship stays put. Moves off the edge of the map wrap around to the other side.
+      - Moves onto a cell where another of the player's ships ends up fail too (repeated
+        until no allied ships share a cell).
+      - Ships of different players that end up on the same cell are all destroyed and
+        their halite is dropped onto the sea floor. Ships swapping cells pass each other.
+      - Ships that reach one of their own Factories/Dropoffs deposit their halite.
+
+   Parameters:
+   -----------
+   maps : np.ndarray
+      Maps of shape (numGames, mapSize, mapSize, 6), modified in place
+   playerHalite : np.ndarray
+      Halite of each player, shape (numGames, numPlayers), modified in place
+   b, y, x : np.ndarray
+      Game, Y and X of every ship
+   owner : np.ndarray
+      Player index (ownership id - 1) of every ship
+   act : np.ndarray
+      Action given to every ship
+
+   Returns:
+   --------
+   failed, collided, deposited : tuple
+      Masks over the ships whose move failed, that were destroyed and that deposited halite
+      (moved onto one of their player's Factories/Dropoffs carrying some)
+   """
+   numGames, height, width = maps.shape[:3]
+   numPlayers = playerHalite.shape[1]
+   player = b * numPlayers + owner
+   onStructure = maps[b, y, x, 2] != 0
+   #Ships on top of a Factory/Dropoff have already deposited, layer 1 there is the structure's
+   cargo = np.where(onStructure, 0, maps[b, y, x, 1])
+
+   moving = (act >= 3) & (act <= 6)
+   costRatio = np.where(maps[b, y, x, 5] == 1, Constants.INSPIRED_MOVE_COST_RATIO, Constants.MOVE_COST_RATIO)
+   failed = moving & (cargo < maps[b, y, x, 0] / costRatio)
+   moving &= ~failed
+   newY, newX = np.divmod(neighborTable(width)[y * width + x, np.where(moving, act - 2, 0)], width)
+   #Cannot move on top of an enemy Factory/Dropoff
+   blocked = (maps[b, newY, newX, 2] != 0) & (maps[b, newY, newX, 4] != owner + 1)
+   newY[blocked] = y[blocked]
+   newX[blocked] = x[blocked]
+   failed |= blocked
+
+   #Allied ships never share a cell: bounce movers back until none do
+   while True:
+      cellKey = (b * height + newY) * width + newX
+      bounced = ((newY != y) | (newX != x)) & (keyCounts(cellKey * numPlayers + owner) > 1)
+      if(not bounced.any()):
+         break
+      newY[bounced] = y[bounced]
+      newX[bounced] = x[bounced]
+      failed |= bounced
+   #Whatever is left sharing a cell belongs to different players
+   collided = keyCounts(cellKey) > 1
+
+   #Lift every ship off the map, then put the survivors down on their new cells
+   maps[b, y, x, 3] = 0
+   leaving = ~onStructure
+   maps[b[leaving], y[leaving], x[leaving], 1] = 0
+   maps[b[leaving], y[leaving], x[leaving], 4] = 0
+   np.add.at(maps[:, :, :, 0], (b[collided], newY[collided], newX[collided]), cargo[collided])
+   alive = ~collided
+   sb, sy, sx = b[alive], newY[alive], newX[alive]
+   deposit = maps[sb, sy, sx, 2] != 0
+   maps[sb[deposit], sy[deposit], sx[deposit], 1] += cargo[alive][deposit]
+   playerHalite += np.bincount(player[alive][deposit], cargo[alive][deposit], playerHalite.size).reshape(playerHalite.shape)
+   maps[sb[~deposit], sy[~deposit], sx[~deposit], 1] = cargo[alive][~deposit]
+   maps[sb, sy, sx, 3] = 1
+   maps[sb, sy, sx, 4] = owner[alive] + 1
+   #Only ships bringing halite in count, not ones that stayed on (or came empty to) a structure
+   deposited = np.zeros_like(alive)
+   deposited[alive] = deposit & (cargo[alive] > 0)
+   return failed, collided, deposited
+
+def spawnShips(maps, playerHalite, actions):
+   """
+   Spawns a Ship on every Factory whose owner asked for it (action 1), if the Factory is
+   empty and the owner can pay for it.
+
+   Parameters:
+   -----------
+   maps : np.ndarray
+      Maps of shape (numGames, mapSize, mapSize, 6), modified in place
+   playerHalite : np.ndarray
+      Halite of each player, shape (numGames, numPlayers), modified in place
+   actions : tuple
+      Sparse actions (see sparseActions)
+
+   Returns:
+   --------
+   failed : np.ndarray
+      Flat player index of every failed spawn
+   """
+   numGames, height, width = maps.shape[:3]
+   numPlayers = playerHalite.shape[1]
+   fb, fy, fx = np.nonzero(maps[:, :, :, 2] == 1)
+   assert np.all(maps[fb, fy, fx, 4] >= 1), "Error, map seems corrupted for factories"
+   owner = maps[fb, fy, fx, 4].astype(np.int64) - 1
+   wanted = lookupActions(actions, ((fb * height + fy) * width + fx) * numPlayers + owner) == 1
+   fb, fy, fx, player = fb[wanted], fy[wanted], fx[wanted], (fb * numPlayers + owner)[wanted]
+   #Ship exists on top of factory already - don't create
+   ok = maps[fb, fy, fx, 3] == 0
+   ok[ok] = affordable(player[ok], np.full(ok.sum(), float(Constants.NEW_ENTITY_ENERGY_COST)), playerHalite.ravel())
+   playerHalite -= Constants.NEW_ENTITY_ENERGY_COST * np.bincount(player[ok], minlength=playerHalite.size).reshape(playerHalite.shape)
+   maps[fb[ok], fy[ok], fx[ok], 3] = 1
+   return player[~ok]
+
+def inspirationMap(maps, numPlayers):
+   """
+   Works out which ships are inspired, i.e. have at least INSPIRATION_SHIP_COUNT enemy ships
+   within INSPIRATION_RADIUS (Manhattan distance, wrapping around the map).
+   The owners of the cells within the radius of every ship are gathered at once with the
+   radius table, so the cost only depends on the number of ships.
+
+   Parameters:
+   -----------
+   maps : np.ndarray
+      Maps of shape (numGames, mapSize, mapSize, 6)
+   numPlayers : int
+      Number of players
+
+   Returns:
+   --------
+   inspired : np.ndarray
+      Boolean array of shape (numGames, mapSize, mapSize), True where an inspired ship is
+   """
+   ships = maps[:, :, :, 3] == 1
+   if(not Constants.INSPIRATION_ENABLED):
+      return np.zeros_like(ships)
+   numGames, height, width = ships.shape
+   #Ownership id of the ship on every cell, 0 where there is none
+   shipOwner = np.where(ships, maps[:, :, :, 4], 0).reshape(numGames, -1)
+   b, cell = np.nonzero(ships.reshape(numGames, -1))
+   nearby = shipOwner[b[:, None], radiusTable(width, Constants.INSPIRATION_RADIUS)[cell]]
+   owner = shipOwner[b, cell]
+   enemies = np.count_nonzero((nearby != 0) & (nearby != owner[:, None]), axis=1)
+   inspired = np.zeros((numGames, height * width), dtype=bool)
+   inspired[b, cell] = enemies >= Constants.INSPIRATION_SHIP_COUNT
+   return inspired.reshape(ships.shape)
+
+def extractionAmounts(halite, cargo, inspired):
+   """
+   Extraction rule on its own. Doesn't change anything, so it can be used on any array
+   of cells (whole maps, batches of maps or a few ships).
+
+   Parameters:
+   -----------
+   halite : np.ndarray
+      Halite on the sea floor under each ship
+   cargo : np.ndarray
+      Halite each ship carries
+   inspired : np.ndarray
+      Whether each ship is inspired
+
+   Returns:
+   --------
+   extracted, gained : tuple
+      Halite taken off the sea floor and halite added to the ship (more than extracted
+      when inspired), both capped so the ship doesn't go over MAX_ENERGY
+   """
+   ratio = np.where(inspired, Constants.INSPIRED_EXTRACT_RATIO, Constants.EXTRACT_RATIO)
+   extracted = np.ceil(halite / ratio)
+   gained = np.where(inspired, extracted * (1 + Constants.INSPIRED_BONUS_MULTIPLIER), extracted)
+   room = Constants.MAX_ENERGY - cargo
+   return np.minimum(extracted, room), np.minimum(gained, room)
+
+def extractHalite(maps, inspired):
+   """
+   Every ship not sitting on a Factory/Dropoff mines the cell it is on, as one masked pass
+   over layers 0 and 1 of the whole map.
+
+   Parameters:
+   -----------
+   maps : np.ndarray
+      Maps of shape (numGames, mapSize, mapSize, 6), modified in place
+   inspired : np.ndarray
+      Boolean array of shape (numGames, mapSize, mapSize) of inspired ships
+   """
+   mining = (maps[:, :, :, 3] == 1) & (maps[:, :, :, 2] == 0)
+   extracted, gained = extractionAmounts(maps[:, :, :, 0], maps[:, :, :, 1], inspired)
+   maps[:, :, :, 1] += np.where(mining, gained, 0)
+   maps[:, :, :, 0] -= np.where(mining, extracted, 0)
+
+def resolveTurn(maps, playerHalite, actions, profiler = None):
+   """
+   Carries out every ship and factory action of one turn. Every ship's action is looked
+   up before anything on the map changes, Dropoffs are built, then all moves are settled
+   together (see moveShips) and finally ships are spawned.
+
+   Parameters:
+   -----------
+   maps : np.ndarray
+      Maps of shape (numGames, mapSize, mapSize, 6), modified in place
+   playerHalite : np.ndarray
+      Halite of each player, shape (numGames, numPlayers), modified in place
+   actions : tuple
+      Sparse actions (see sparseActions)
+   profiler : StepProfiler
+      Profiler to time the phases on and count into (already started), or None
+
+   Returns:
+   --------
+   invalid : np.ndarray
+      Number of invalid actions of each player, shape (numGames, numPlayers)
+   """
+   numGames, height, width = maps.shape[:3]
+   numPlayers = playerHalite.shape[1]
+   invalid = np.zeros(playerHalite.size)
+   b, y, x = np.nonzero(maps[:, :, :, 3] == 1)
+   owner = maps[b, y, x, 4].astype(np.int64) - 1
+   act = lookupActions(actions, ((b * height + y) * width + x) * numPlayers + owner)
+   player = b * numPlayers + owner
+   if(profiler is not None):
+      profiler.lap('actions')
+      profiler.count('ships', len(b))
+
+   converted, failed = constructDropoffs(maps, playerHalite, b, y, x, player, act)
+   invalid += np.bincount(player[failed], minlength=invalid.size)
+   if(profiler is not None):
+      profiler.lap('dropoffs')
+      profiler.count('dropoffs', np.count_nonzero(converted))
+   ships = ~converted
+   failed, collided, deposited = moveShips(maps, playerHalite, b[ships], y[ships], x[ships], owner[ships], act[ships])
+   invalid += np.bincount(player[ships][failed], minlength=invalid.size)
+   if(profiler is not None):
+      profiler.lap('moves')
+      profiler.count('collisions', np.count_nonzero(collided))
+      profiler.count('deposits', np.count_nonzero(deposited))
+   invalid += np.bincount(spawnShips(maps, playerHalite, actions), minlength=invalid.size)
+   if(profiler is not None):
+      profiler.lap('spawns')
+      profiler.count('invalid', invalid.sum())
+   return invalid.reshape(playerHalite.shape)
+
+def stepGames(maps, playerHalite, actions, profiler = None):
+   """
+   Plays one turn of every game in <maps> at once. See HaliteEnv.step for the actions.
+
+   Parameters:
+   -----------
+   maps : np.ndarray
+      Maps of shape (numGames, mapSize, mapSize, 6), modified in place
+   playerHalite : np.ndarray
+      Halite of each player, shape (numGames, numPlayers), modified in place
+   actions : np.ndarray or tuple
+      Actions of shape (numGames, mapSize, mapSize, numPlayers), or sparse actions (see sparseActions)
+   profiler : StepProfiler
+      Profiler to time the phases on and count into (already started), or None
+
+   Returns:
+   --------
+   reward : np.ndarray
+      Reward of each player, shape (numGames, numPlayers)
+   """
+   if(isinstance(actions, np.ndarray)):
+      actions = sparseActions(actions)
+   invalid = resolveTurn(maps, playerHalite, actions, profiler)
+   inspired = inspirationMap(maps, playerHalite.shape[1])
+   maps[:, :, :, 5] = inspired
+   if(profiler is not None):
+      profiler.lap('inspiration')
+   extractHalite(maps, inspired)
+   if(profiler is not None):
+      profiler.lap('extraction')
+   #Deinceventize outright bad/invalid moves
+   return playerHalite * 0.0005 - 0.1 * invalid
+
+def episodeLength(mapSize):
+   """
+   Number of turns in a game on a <mapSize> map. Like the Halite III engine, it goes up linearly
+   from MIN_TURNS on maps of MIN_TURN_THRESHOLD to MAX_TURNS on maps of MAX_TURN_THRESHOLD.
+   """
+   fraction = (mapSize - Constants.MIN_TURN_THRESHOLD) / (Constants.MAX_TURN_THRESHOLD - Constants.MIN_TURN_THRESHOLD)
+   fraction = min(max(fraction, 0.0), 1.0)
+   return int(Constants.MIN_TURNS + fraction * (Constants.MAX_TURNS - Constants.MIN_TURNS))
+
+def terminalRewards(playerHalite):
+   """
+   Reward for the end of each game, by rank: the players with the most halite get
+   +TERMINAL_REWARD and the last get -TERMINAL_REWARD, with the ranks in between spread evenly
+   (so with 2 players the winner gets + and the loser -). Tied players share the better rank.
+
+   Parameters:
+   -----------
+   playerHalite : np.ndarray
+      Halite of each player, shape (numGames, numPlayers)
+
+   Returns:
+   --------
+   reward : np.ndarray
+      Terminal reward of each player, shape (numGames, numPlayers)
+   """
+   numPlayers = playerHalite.shape[1]
+   #Rank 0 is the best: the number of players with more halite
+   rank = np.sum(playerHalite[:, None, :] > playerHalite[:, :, None], axis=2)
+   return TERMINAL_REWARD * (1 - 2 * rank / max(numPlayers - 1, 1))
@@ -0,0 +1,120 @@
+import time
+
+class StepProfiler:
+   """
+   Times the phases of each step and counts what happened in it. Give one to an environment
+   (the <profiler> argument or attribute of HaliteEnv and BatchedHaliteEnv) to turn profiling on;
+   without one the step only pays for a few "is None" checks.
+      actions     - converting actions and looking up every ship's action
+      dropoffs    - building Dropoffs
+      moves       - moving ships, collisions and deposits
+      spawns      - spawning ships
+      inspiration - working out which ships are inspired
+      extraction  - ships mining halite
+      other       - rewards, episode end, observations and replays
+   A compiled HaliteEnv plays the turn in one call, which is all timed as moves, and only
+   counts invalid actions.
+   Counters (summed over every game of a batch):
+      ships      - ships processed
+      collisions - ships destroyed in collisions
+      deposits   - ships that deposited halite
+      dropoffs   - Dropoffs built
+      invalid    - invalid actions
+
+   Attributes:
+   -----------
+   self.steps : int
+      Number of steps profiled
+
+   self.totals : dict
+      Total seconds of each phase
+
+   self.counts : dict
+      Total of each counter
+
+   self.last : dict
+      Seconds of each phase in the last step
+
+   self.lastCounts : dict
+      Counters of the last step
+
+   self.callbacks : list
+      Functions called with the profiler after every step, e.g. to export metrics
+   """
+   PHASES = ('actions', 'dropoffs', 'moves', 'spawns', 'inspiration', 'extraction', 'other')
+   COUNTERS = ('ships', 'collisions', 'deposits', 'dropoffs', 'invalid')
+
+   def __init__(self, callback = None):
+      """
+      StepProfiler initialization function.
+
+      Parameters:
+      -----------
+      callback : function
+         Called as callback(profiler) after every step (more can be added to self.callbacks)
+      """
+      self.callbacks = [] if callback is None else [callback]
+      self.reset()
+
+   def reset(self):
+      """
+      Clears all timings and counters.
+      """
+      self.steps = 0
+      self.totals = dict.fromkeys(self.PHASES, 0.0)
+      self.counts = dict.fromkeys(self.COUNTERS, 0)
+      self.last = dict.fromkeys(self.PHASES, 0.0)
+      self.lastCounts = dict.fromkeys(self.COUNTERS, 0)
+      self.lapStart = time.perf_counter()
+
+   def start(self):
+      """
+      Starts timing a step.
+      """
+      for phase in self.PHASES:
+         self.last[phase] = 0.0
+      for counter in self.COUNTERS:
+         self.lastCounts[counter] = 0
+      self.lapStart = time.perf_counter()
+
+   def lap(self, phase):
+      """
+      Adds the time since the last lap (or start()) to <phase>.
+      """
+      now = time.perf_counter()
+      self.last[phase] += now - self.lapStart
+      self.lapStart = now
+
+   def count(self, counter, amount):
+      """
+      Adds <amount> to <counter>.
+      """
+      self.lastCounts[counter] += int(amount)
+
+   def finish(self):
+      """
+      Ends the step: adds it to the totals and calls the callbacks.
+      """
+      self.steps += 1
+      for phase in self.PHASES:
+         self.totals[phase] += self.last[phase]
+      for counter in self.COUNTERS:
+         self.counts[counter] += self.lastCounts[counter]
+      for callback in self.callbacks:
+         callback(self)
+
+   def summary(self):
+      """
+      Averages per step.
+
+      Returns:
+      --------
+      summary : dict
+         'steps', 'seconds' (total seconds per step), and the average seconds of every phase
+         and average of every counter per step, keyed by their names
+      """
+      steps = max(self.steps, 1)
+      summary = {'steps':self.steps, 'seconds':sum(self.totals.values()) / steps}
+      summary.update({phase + 'Seconds': total / steps for phase, total in self.totals.items()})
+      summary.update({counter: total / steps for counter, total in self.counts.items()})
+      return summary
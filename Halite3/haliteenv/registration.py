@@ -0,0 +1,48 @@
+"""
+Registers the Halite III environments with gym, so gym.make('HEnv2PTrain-v0') creates one.
+Importing haliteenv does this straight away when gym is already imported, and so does using
+HaliteEnv; otherwise import this module (or make 'haliteenv.registration:HEnv2PTrain-v0').
+"""
+from gym.envs.registration import register
+from haliteenv.engine import MapType, MapSize
+
+register(
+   id='HEnv2PTrain-v0',
+   entry_point='haliteenv.haliteenv:HaliteEnv',
+   kwargs={
+      'numPlayers':2,
+      'mapType':MapType.BASIC,
+      'mapSize':MapSize.MEDIUM,
+      'regenMapOnReset':False
+   },
+)
+register(
+   id='HEnv2PTrain-v1',
+   entry_point='haliteenv.haliteenv:HaliteEnv',
+   kwargs={
+      'numPlayers':2,
+      'mapType':MapType.BASIC,
+      'mapSize':MapSize.MEDIUM,
+      'regenMapOnReset':True
+   },
+)
+register(
+   id='HEnv4PTrain-v0',
+   entry_point='haliteenv.haliteenv:HaliteEnv',
+   kwargs={
+      'numPlayers':4,
+      'mapType':MapType.BASIC,
+      'mapSize':MapSize.MEDIUM,
+      'regenMapOnReset':False
+   },
+)
+register(
+   id='HEnv4PTrain-v1',
+   entry_point='haliteenv.haliteenv:HaliteEnv',
+   kwargs={
+      'numPlayers':4,
+      'mapType':MapType.BASIC,
+      'mapSize':MapSize.MEDIUM,
+      'regenMapOnReset':True
+   },
+)
@@ -0,0 +1,206 @@
+import os
+import subprocess
+import numpy as np
+from haliteenv.constants import Constants
+from haliteenv.replay import ReplayReader
+
+#Colors of the sea floor with no halite and with MAX_ENERGY or more
+HALITE_LOW = np.array([10, 20, 45], dtype=np.float32)
+HALITE_HIGH = np.array([255, 205, 60], dtype=np.float32)
+#Ship colors of ownership ids 1 - 4, with lighter Factories and darker Dropoffs
+PLAYER_COLORS = np.array([[230, 60, 60], [50, 150, 230], [60, 200, 100], [180, 90, 220]], dtype=np.uint8)
+FACTORY_COLORS = (PLAYER_COLORS // 2 + 128).astype(np.uint8)
+DROPOFF_COLORS = (PLAYER_COLORS // 2).astype(np.uint8)
+
+def rgbFrame(map, scale = 1, out = None):
+   """
+   Draws a map straight into an RGB image with NumPy: the halite on the sea floor shaded from
+   dark blue to gold, with ships, Factories and Dropoffs in their owner's colors.
+
+   Parameters:
+   -----------
+   map : np.ndarray
+      Map (or observation) of shape (mapSize, mapSize, layers), layers as in HaliteEnv.map
+   scale : int
+      Pixels per cell along each side
+   out : np.ndarray
+      Buffer of shape (mapSize * scale, mapSize * scale, 3) (uint8) to draw into (allocated if None)
+
+   Returns:
+   --------
+   frame : np.ndarray
+      The image, shape (mapSize * scale, mapSize * scale, 3) (uint8)
+   """
+   halite = np.minimum(map[:, :, 0] * (1.0 / Constants.MAX_ENERGY), 1.0)[:, :, None]
+   cells = (HALITE_LOW + halite * (HALITE_HIGH - HALITE_LOW)).astype(np.uint8)
+   owner = (map[:, :, 4].astype(np.int64) - 1) % len(PLAYER_COLORS)
+   ships = map[:, :, 3] == 1
+   cells[ships] = PLAYER_COLORS[owner[ships]]
+   factories = map[:, :, 2] == 1
+   cells[factories] = FACTORY_COLORS[owner[factories]]
+   dropoffs = map[:, :, 2] == -1
+   cells[dropoffs] = DROPOFF_COLORS[owner[dropoffs]]
+   if(out is None):
+      out = np.empty((cells.shape[0] * scale, cells.shape[1] * scale, 3), dtype=np.uint8)
+   #Every cell becomes a scale x scale block
+   out.reshape(cells.shape[0], scale, cells.shape[1], scale, 3)[:] = cells[:, None, :, None]
+   return out
+
+class FrameRenderer:
+   """
+   Renders maps through one matplotlib figure that is created once and kept: each frame only
+   updates the image and text artists in place and redraws the canvas. Draws off-screen (Agg),
+   so it works without a display.
+
+   Attributes:
+   -----------
+   self.figure : matplotlib.figure.Figure
+      The figure frames are drawn on
+
+   self.image : matplotlib.image.AxesImage
+      Artist showing the map (see rgbFrame)
+
+   self.text : matplotlib.text.Text
+      Artist showing the turn and player halite
+   """
+   def __init__(self, mapSize, scale = 8, dpi = 100):
+      """
+      FrameRenderer initialization function.
+
+      Parameters:
+      -----------
+      mapSize : int
+         Size of map (for x and y)
+      scale : int
+         Pixels per cell along each side
+      dpi : int
+         Resolution of the figure
+      """
+      from matplotlib.figure import Figure
+      from matplotlib.backends.backend_agg import FigureCanvasAgg
+      self.scale = scale
+      size = mapSize * scale
+      self.frame = np.zeros((size, size, 3), dtype=np.uint8)
+      self.figure = Figure(figsize=(size / dpi, size / dpi), dpi=dpi)
+      self.canvas = FigureCanvasAgg(self.figure)
+      axes = self.figure.add_axes([0, 0, 1, 1])
+      axes.set_axis_off()
+      self.image = axes.imshow(self.frame, interpolation='nearest')
+      self.text = axes.text(0.01, 0.99, "", transform=axes.transAxes, color='white', fontsize=8, va='top', family='monospace')
+
+   def render(self, map, playerHalite = None, turn = None):
+      """
+      Renders a map, with the turn and player halite (if given) written over it.
+
+      Returns:
+      --------
+      frame : np.ndarray
+         RGB image of the figure, shape (height, width, 3) (uint8). It is a view of the canvas,
+         overwritten by the next render.
+      """
+      self.image.set_data(rgbFrame(map, self.scale, self.frame))
+      lines = [] if turn is None else ["Turn " + str(turn)]
+      if(playerHalite is not None):
+         lines += ["P" + str(player + 1) + " " + str(int(halite)) for player, halite in enumerate(np.ravel(playerHalite))]
+      self.text.set_text("\n".join(lines))
+      self.canvas.draw()
+      return np.asarray(self.canvas.buffer_rgba())[:, :, :3]
+
+def replayFrames(replay, scale = 4, renderer = None):
+   """
+   Frames of every turn of a replay, read in order.
+
+   Parameters:
+   -----------
+   replay : str or ReplayReader
+      Replay file (or an open reader)
+   scale : int
+      Pixels per cell along each side (ignored with a <renderer>)
+   renderer : FrameRenderer
+      Renderer adding the turn and player halite, or None for plain rgbFrame images
+
+   Yields:
+   -------
+   frame : np.ndarray
+      RGB image of each turn (uint8), reused for the next turn
+   """
+   reader = ReplayReader(replay) if isinstance(replay, str) else replay
+   frame = None
+   try:
+      for turn in range(0, len(reader)):
+         map, playerHalite = reader.observation(turn)
+         if(renderer is not None):
+            yield renderer.render(map, playerHalite, turn)
+         else:
+            frame = rgbFrame(map, scale, frame)
+            yield frame
+   finally:
+      if(reader is not replay):
+         reader.close()
+
+def exportFrames(replay, directory, scale = 4, renderer = None):
+   """
+   Writes every turn of a replay as a PNG file, <directory>/turn0000.png onwards.
+
+   Returns:
+   --------
+   numFrames : int
+      Number of frames written
+   """
+   import matplotlib.image
+   os.makedirs(directory, exist_ok=True)
+   numFrames = 0
+   for turn, frame in enumerate(replayFrames(replay, scale, renderer)):
+      matplotlib.image.imsave(os.path.join(directory, "turn%04d.png" % turn), frame)
+      numFrames += 1
+   return numFrames
+
+def exportVideo(replay, path, fps = 15, scale = 4, renderer = None, ffmpeg = 'ffmpeg'):
+   """
+   Encodes every turn of a replay into a video file with ffmpeg (which must be installed).
+   Frames are piped to it as raw RGB, so the cost is one frame per turn plus the encoding.
+
+   Parameters:
+   -----------
+   replay : str or ReplayReader
+      Replay file (or an open reader)
+   path : str
+      Video file to write, its format following the extension (e.g. .mp4, .gif)
+   fps : int
+      Turns per second
+   scale : int
+      Pixels per cell along each side (ignored with a <renderer>)
+   renderer : FrameRenderer
+      Renderer adding the turn and player halite, or None for plain rgbFrame images
+   ffmpeg : str
+      ffmpeg executable
+
+   Returns:
+   --------
+   numFrames : int
+      Number of frames written
+   """
+   process = None
+   numFrames = 0
+   try:
+      for frame in replayFrames(replay, scale, renderer):
+         if(process is None):
+            height, width = frame.shape[:2]
+            command = [ffmpeg, '-loglevel', 'error', '-y', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                       '-s', str(width) + 'x' + str(height), '-r', str(fps), '-i', '-']
+            if(path.endswith('.mp4')):
+               #Most players need even dimensions and yuv420p
+               command += ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p']
+            try:
+               process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+            except FileNotFoundError:
+               raise RuntimeError("exportVideo needs ffmpeg (" + ffmpeg + "), use exportFrames instead")
+         process.stdin.write(np.ascontiguousarray(frame).tobytes())
+         numFrames += 1
+   finally:
+      if(process is not None):
+         process.stdin.close()
+         process.wait()
+   if(process is not None and process.returncode != 0):
+      raise RuntimeError("ffmpeg failed with exit code " + str(process.returncode))
+   return numFrames
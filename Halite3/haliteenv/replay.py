@@ -0,0 +1,271 @@
+import mmap
+import struct
+import numpy as np
+from haliteenv import kernels
+from haliteenv.delta import DeltaTracker
+
+#File layout (little-endian):
+#   Header: magic, version, mapSize, numPlayers, keyframeInterval
+#   One record per turn, appended as the game is played:
+#      turn, kind (KEYFRAME or DELTA), numActions, numValues
+#      playerHalite (int64 * numPlayers), reward (float64 * numPlayers)
+#      DELTA only: indices of the changed observation elements (int32 * numValues)
+#      values of the observation (int32 * numValues, every value in an observation is a whole number)
+#      action keys (int32 * numActions, cell * numPlayers + player) and commands (int8 * numActions)
+#      padding to a multiple of 8 bytes
+#   Footer, written on close: offset of every record (uint64 * numRecords), numRecords, footer offset, end magic
+HEADER = struct.Struct('<8sHHHHI12x')
+RECORD = struct.Struct('<IIII')
+TRAILER = struct.Struct('<QQ8s')
+MAGIC = b'HLT3RPL\x00'
+END_MAGIC = b'HLT3END\x00'
+VERSION = 1
+KEYFRAME = 1
+DELTA = 0
+
+class ReplayWriter:
+   """
+   Records a game turn by turn into an append-only binary replay file. Observations are stored as
+   deltas from the previous turn, with a full keyframe every <keyframeInterval> turns so any turn
+   can be rebuilt from a few records. A footer indexing every record is written by close().
+
+   Attributes:
+   -----------
+   self.turns : int
+      Number of turns recorded so far
+   """
+   def __init__(self, path, mapSize, numPlayers, keyframeInterval = 50):
+      """
+      ReplayWriter initialization function.
+
+      Parameters:
+      -----------
+      path : str
+         File to write to (overwritten)
+      mapSize : int
+         Size of map (for x and y)
+      numPlayers : int
+         Number of players
+      keyframeInterval : int
+         Number of turns between full observations
+      """
+      self.file = open(path, 'wb')
+      self.mapSize = mapSize
+      self.numPlayers = numPlayers
+      self.keyframeInterval = keyframeInterval
+      self.tracker = DeltaTracker(mapSize)
+      self.offsets = []
+      self.turns = 0
+      self.file.write(HEADER.pack(MAGIC, VERSION, mapSize, numPlayers, 0, keyframeInterval))
+
+   def record(self, observation, playerHalite, action = None, reward = None):
+      """
+      Appends one turn: the observation after the turn, and the action and reward that led to it.
+      The first turn recorded is normally the starting map, with no action.
+
+      Parameters:
+      -----------
+      observation : np.ndarray
+         Map observation, shape (mapSize, mapSize, 5)
+      playerHalite : np.ndarray
+         Halite of each player
+      action : np.ndarray or tuple
+         Dense actions of shape (mapSize, mapSize, numPlayers) or the sparse (keys, commands)
+         of kernels.sparseActions (None if there weren't any)
+      reward : np.ndarray
+         Reward of each player (None for zeros)
+      """
+      keys, commands = self.actionKeys(action)
+      delta = self.tracker.diff(observation)
+      if(self.turns % self.keyframeInterval == 0):
+         kind = KEYFRAME
+         values = np.rint(self.tracker.observation).astype(np.int32).reshape(-1)
+      else:
+         kind = DELTA
+         values = np.rint(delta.values).astype(np.int32)
+      reward = np.zeros(self.numPlayers) if reward is None else reward
+      self.offsets.append(self.file.tell())
+      parts = [RECORD.pack(self.turns, kind, len(keys), len(values)),
+               np.asarray(playerHalite, dtype=np.float64).reshape(-1).astype(np.int64).tobytes(),
+               np.asarray(reward, dtype=np.float64).reshape(-1).tobytes()]
+      if(kind == DELTA):
+         parts.append(delta.indices.astype(np.int32).tobytes())
+      parts += [values.tobytes(), keys.astype(np.int32).tobytes(), commands.astype(np.int8).tobytes()]
+      size = sum([len(part) for part in parts])
+      parts.append(bytes(-size % 8))
+      self.file.write(b''.join(parts))
+      self.turns += 1
+
+   def actionKeys(self, action):
+      """
+      Converts <action> into sorted keys (cell * numPlayers + player) and commands.
+      """
+      if(action is None):
+         return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+      if(isinstance(action, np.ndarray)):
+         return kernels.sparseActions(action[None])
+      return action
+
+   def close(self):
+      """
+      Writes the footer and closes the file.
+      """
+      if(self.file.closed):
+         return
+      footer = self.file.tell()
+      self.file.write(np.array(self.offsets, dtype=np.uint64).tobytes())
+      self.file.write(TRAILER.pack(len(self.offsets), footer, END_MAGIC))
+      self.file.close()
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *args):
+      self.close()
+
+class ReplayReader:
+   """
+   Reads a replay file written by ReplayWriter. The file is memory-mapped and every array is a
+   view of it, so opening a replay reads only its header and footer and any turn can be reached
+   by reading its keyframe and the deltas after it.
+
+   Attributes:
+   -----------
+   self.mapSize : int
+      Size of map (for x and y)
+
+   self.numPlayers : int
+      Number of players
+
+   self.offsets : np.ndarray
+      Offset of every turn's record in the file
+   """
+   def __init__(self, path):
+      """
+      ReplayReader initialization function. If the file has no footer (the writer never closed),
+      the records are found by walking through them instead.
+      """
+      self.file = open(path, 'rb')
+      self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+      magic, version, self.mapSize, self.numPlayers, unused, self.keyframeInterval = HEADER.unpack_from(self.buffer, 0)
+      assert magic == MAGIC, "Not a replay file"
+      assert version == VERSION, "Unsupported replay version " + str(version)
+      numRecords, footer, endMagic = TRAILER.unpack_from(self.buffer, len(self.buffer) - TRAILER.size)
+      if(endMagic == END_MAGIC):
+         self.offsets = np.frombuffer(self.buffer, dtype=np.uint64, count=numRecords, offset=footer)
+      else:
+         self.offsets = self.scanRecords()
+      self.tracker = DeltaTracker(self.mapSize)
+      self.trackerTurn = -1
+
+   def scanRecords(self):
+      """
+      Finds every complete record by walking through the file.
+      """
+      offsets = []
+      offset = HEADER.size
+      while offset + RECORD.size <= len(self.buffer):
+         end = offset + self.recordSize(offset)
+         if(end > len(self.buffer)):
+            break
+         offsets.append(offset)
+         offset = end
+      return np.array(offsets, dtype=np.uint64)
+
+   def recordSize(self, offset):
+      """
+      Size in bytes of the record at <offset>, including padding.
+      """
+      turn, kind, numActions, numValues = RECORD.unpack_from(self.buffer, offset)
+      size = RECORD.size + 16 * self.numPlayers + 4 * numValues * (2 if kind == DELTA else 1) + 5 * numActions
+      return size + (-size % 8)
+
+   def readRecord(self, turn):
+      """
+      Views of the arrays of <turn>'s record.
+
+      Returns:
+      --------
+      kind, playerHalite, reward, indices, values, keys, commands : tuple
+         <indices> is None for keyframes
+      """
+      offset = int(self.offsets[turn])
+      recordTurn, kind, numActions, numValues = RECORD.unpack_from(self.buffer, offset)
+      offset += RECORD.size
+      playerHalite = np.frombuffer(self.buffer, dtype=np.int64, count=self.numPlayers, offset=offset)
+      offset += 8 * self.numPlayers
+      reward = np.frombuffer(self.buffer, dtype=np.float64, count=self.numPlayers, offset=offset)
+      offset += 8 * self.numPlayers
+      indices = None
+      if(kind == DELTA):
+         indices = np.frombuffer(self.buffer, dtype=np.int32, count=numValues, offset=offset)
+         offset += 4 * numValues
+      values = np.frombuffer(self.buffer, dtype=np.int32, count=numValues, offset=offset)
+      offset += 4 * numValues
+      keys = np.frombuffer(self.buffer, dtype=np.int32, count=numActions, offset=offset)
+      offset += 4 * numActions
+      commands = np.frombuffer(self.buffer, dtype=np.int8, count=numActions, offset=offset)
+      return kind, playerHalite, reward, indices, values, keys, commands
+
+   def __len__(self):
+      return len(self.offsets)
+
+   def observation(self, turn):
+      """
+      Rebuilds the observation of <turn>, from the closest keyframe at or before it (or from the
+      last turn rebuilt, when reading forwards).
+
+      Returns:
+      --------
+      ob : tuple
+         (<map>, <playerHalite>) as HaliteEnv.step returns them, shape (mapSize, mapSize, 5) and (numPlayers, 1)
+      """
+      assert 0 <= turn < len(self), "Turn " + str(turn) + " is not in the replay"
+      start = turn
+      while self.readRecord(start)[0] != KEYFRAME and start != self.trackerTurn + 1:
+         start -= 1
+      for current in range(start, turn + 1):
+         kind, playerHalite, reward, indices, values = self.readRecord(current)[:5]
+         if(kind == KEYFRAME):
+            self.tracker.observation.reshape(-1)[:] = values
+         else:
+            self.tracker.observation.reshape(-1)[indices] = values
+      self.trackerTurn = turn
+      return (self.tracker.materialize(), playerHalite.astype(np.float64).reshape(-1, 1))
+
+   def actions(self, turn):
+      """
+      Actions that led to <turn> as arrays (player, cell, command), player being ownership id - 1.
+      """
+      keys, commands = self.readRecord(turn)[5:]
+      return keys % self.numPlayers, keys // self.numPlayers, commands.astype(np.int64)
+
+   def denseActions(self, turn):
+      """
+      Actions that led to <turn> as a (mapSize, mapSize, numPlayers) array, like HaliteEnv.step takes.
+      """
+      keys, commands = self.readRecord(turn)[5:]
+      action = np.zeros((self.mapSize, self.mapSize, self.numPlayers), dtype=np.int64)
+      action.reshape(-1)[keys] = commands
+      return action
+
+   def reward(self, turn):
+      """
+      Reward of each player for the turn that led to <turn>.
+      """
+      return self.readRecord(turn)[2].copy()
+
+   def close(self):
+      """
+      Unmaps and closes the file.
+      """
+      self.offsets = None
+      self.tracker = None
+      self.buffer.close()
+      self.file.close()
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *args):
+      self.close()
@@ -0,0 +1,93 @@
+import numpy as np
+
+class EnvState:
+   """
+   Saved state of a HaliteEnv (see HaliteEnv.getState). If it came from a StatePool its arrays
+   are a slot of the pool's buffers, which goes back to the pool with StatePool.release().
+
+   Attributes:
+   -----------
+   self.map : np.ndarray
+      Copy of HaliteEnv.map
+
+   self.playerHalite : np.ndarray
+      Copy of HaliteEnv.playerHalite
+
+   self.turn : int
+      Copy of HaliteEnv.turn
+
+   self.slot : int
+      Slot of the pool the arrays belong to (None if not pooled)
+
+   self.pool : StatePool
+      Pool the arrays belong to (None if not pooled)
+   """
+   __slots__ = ('map', 'playerHalite', 'turn', 'slot', 'pool')
+
+   def __init__(self, map, playerHalite, slot = None, turn = 0, pool = None):
+      self.map = map
+      self.playerHalite = playerHalite
+      self.turn = turn
+      self.slot = slot
+      self.pool = pool
+
+class StatePool:
+   """
+   Preallocated buffers for saved states, so planners can save and restore states thousands
+   of times per move without allocating. When every slot is in use the pool doubles in size,
+   so <capacity> only needs to cover the usual number of live states (each slot of a 64x64 map
+   takes 192 KB).
+
+   Attributes:
+   -----------
+   self.maps : np.ndarray
+      Map buffers, shape (capacity, mapSize, mapSize, 6)
+
+   self.playerHalite : np.ndarray
+      Player halite buffers, shape (capacity, numPlayers, 1)
+
+   self.free : list
+      Slots not in use
+
+   self.used : np.ndarray
+      Whether each slot is handed out
+   """
+   def __init__(self, mapSize, numPlayers, capacity = 64):
+      """
+      StatePool initialization function.
+      """
+      self.maps = np.empty((capacity, mapSize, mapSize, 6))
+      self.playerHalite = np.empty((capacity, numPlayers, 1))
+      self.free = list(range(capacity - 1, -1, -1))
+      self.used = np.zeros(capacity, dtype=bool)
+
+   def acquire(self):
+      """
+      Takes a free slot.
+
+      Returns:
+      --------
+      state : EnvState
+         State whose arrays are the slot's buffers (contents undefined)
+      """
+      if(not self.free):
+         #States already handed out keep the old buffers alive, so nothing needs copying
+         capacity = len(self.maps)
+         self.maps = np.empty((2 * capacity,) + self.maps.shape[1:])
+         self.playerHalite = np.empty((2 * capacity,) + self.playerHalite.shape[1:])
+         self.free = list(range(2 * capacity - 1, capacity - 1, -1))
+         self.used = np.concatenate([self.used, np.zeros(capacity, dtype=bool)])
+      slot = self.free.pop()
+      self.used[slot] = True
+      return EnvState(self.maps[slot], self.playerHalite[slot], slot, pool=self)
+
+   def release(self, state):
+      """
+      Gives the slot of <state> back to the pool. <state> must not be used afterwards.
+      """
+      assert state.pool is self, "State doesn't belong to this pool"
+      assert state.slot is not None, "State was already released"
+      assert self.used[state.slot], "Slot " + str(state.slot) + " was already released"
+      self.used[state.slot] = False
+      self.free.append(state.slot)
+      state.slot = None
@@ -0,0 +1,127 @@
+import numpy as np
+
+#Bit planes of CompactState.flags
+SHIP_FLAG = 0
+FACTORY_FLAG = 1
+DROPOFF_FLAG = 2
+INSPIRED_FLAG = 3
+NUM_FLAGS = 4
+
+class ShipTable:
+   """
+   Ships of one state as parallel arrays, one element per ship in row-major order.
+   The environment doesn't follow ships from turn to turn, so a ship's id is the
+   flat index (y * mapSize + x) of the cell it is on.
+
+   Attributes:
+   -----------
+   self.id : np.ndarray (int32)
+   self.x : np.ndarray (uint8)
+   self.y : np.ndarray (uint8)
+   self.cargo : np.ndarray (uint16)
+      Halite on the ship (0 for ships on a Factory/Dropoff, they have already deposited)
+   self.owner : np.ndarray (int8)
+      Ownership id of the ship
+   """
+   __slots__ = ('id', 'x', 'y', 'cargo', 'owner')
+
+   def __init__(self, id, x, y, cargo, owner):
+      self.id = id
+      self.x = x
+      self.y = y
+      self.cargo = cargo
+      self.owner = owner
+
+   def __len__(self):
+      return len(self.id)
+
+   @property
+   def nbytes(self):
+      return self.id.nbytes + self.x.nbytes + self.y.nbytes + self.cargo.nbytes + self.owner.nbytes
+
+class CompactState:
+   """
+   Compact copy of a HaliteEnv state (self.map and self.playerHalite) for storing many states,
+   e.g. in replay buffers. A 64x64 state takes about 14 KB plus 9 bytes per ship instead of 192 KB.
+
+   Attributes:
+   -----------
+   self.halite : np.ndarray (uint16)
+      Halite on the sea floor (layer 0)
+
+   self.owner : np.ndarray (int8)
+      Ownership (layer 4)
+
+   self.flags : np.ndarray (uint8)
+      Ship, Factory, Dropoff and inspired (layers 2, 3 and 5) as bit planes packed with np.packbits,
+      shape (NUM_FLAGS, ceil(mapSize * mapSize / 8))
+
+   self.structureHalite : np.ndarray (uint32)
+      Halite stored in each Factory/Dropoff (layer 1 on structures), in row-major order
+
+   self.ships : ShipTable
+      Every ship, with its halite (layer 1 on ships)
+
+   self.playerHalite : np.ndarray (int32)
+      Halite of each player
+
+   self.mapSize : int
+      Size of map (for x and y)
+   """
+   __slots__ = ('halite', 'owner', 'flags', 'structureHalite', 'ships', 'playerHalite', 'mapSize')
+
+   def __init__(self, map, playerHalite):
+      """
+      Compresses <map> (the (mapSize, mapSize, 6) map of HaliteEnv) and <playerHalite>.
+      All halite amounts in the game are whole numbers, so nothing is lost.
+      """
+      self.mapSize = map.shape[0]
+      self.halite = map[:, :, 0].astype(np.uint16)
+      self.owner = map[:, :, 4].astype(np.int8)
+      structures = map[:, :, 2]
+      planes = np.stack((map[:, :, 3] == 1, structures == 1, structures == -1, map[:, :, 5] == 1))
+      self.flags = np.packbits(planes.reshape(NUM_FLAGS, -1), axis=1)
+      self.structureHalite = map[:, :, 1][structures != 0].astype(np.uint32)
+      y, x = np.nonzero(map[:, :, 3] == 1)
+      cargo = np.where(structures[y, x] != 0, 0, map[y, x, 1])
+      self.ships = ShipTable((y * self.mapSize + x).astype(np.int32), x.astype(np.uint8), y.astype(np.uint8),
+                             cargo.astype(np.uint16), self.owner[y, x])
+      self.playerHalite = np.asarray(playerHalite).reshape(-1).astype(np.int32)
+
+   def flag(self, index):
+      """
+      Unpacks one of the flag planes (SHIP_FLAG, FACTORY_FLAG, DROPOFF_FLAG, INSPIRED_FLAG)
+      as a (mapSize, mapSize) bool array.
+      """
+      cells = self.mapSize * self.mapSize
+      return np.unpackbits(self.flags[index], count=cells).reshape(self.mapSize, self.mapSize).astype(bool)
+
+   def toMap(self):
+      """
+      Rebuilds the full (mapSize, mapSize, 6) float64 map and (numPlayers, 1) playerHalite
+      of HaliteEnv.
+      """
+      map = np.zeros((self.mapSize, self.mapSize, 6))
+      map[:, :, 0] = self.halite
+      structures = np.zeros((self.mapSize, self.mapSize))
+      structures[self.flag(FACTORY_FLAG)] = 1
+      structures[self.flag(DROPOFF_FLAG)] = -1
+      map[:, :, 2] = structures
+      map[:, :, 1][structures != 0] = self.structureHalite
+      map[self.ships.y, self.ships.x, 1] += self.ships.cargo
+      map[self.ships.y, self.ships.x, 3] = 1
+      map[:, :, 4] = self.owner
+      map[:, :, 5] = self.flag(INSPIRED_FLAG)
+      return map, self.playerHalite.astype(np.float64).reshape(-1, 1)
+
+   def observation(self):
+      """
+      Builds the observation HaliteEnv.step returns, (<map>, <playerHalite>) with layers 0 - 4 of the map.
+      """
+      map, playerHalite = self.toMap()
+      return (map[:, :, :5], playerHalite)
+
+   @property
+   def nbytes(self):
+      return (self.halite.nbytes + self.owner.nbytes + self.flags.nbytes + self.structureHalite.nbytes
+              + self.ships.nbytes + self.playerHalite.nbytes)
@@ -0,0 +1,312 @@
+import asyncio
+import time
+import traceback
+import multiprocessing as mp
+from multiprocessing import connection, shared_memory
+import numpy as np
+from haliteenv.batched import BatchedHaliteEnv
+from haliteenv.engine import spawnSeeds
+from haliteenv.asyncenv import StepTimings
+
+#Commands sent to workers. Only these single bytes go through the pipes,
+#observations/rewards/actions are exchanged through shared memory
+STEP = b's'
+RESET = b'r'
+CLOSE = b'c'
+DONE = b'd'
+#Reply of a worker whose command raised, followed by the traceback
+ERROR = b'e'
+
+def createSharedArray(shape, dtype):
+   """
+   Creates a shared memory block holding an array of <shape> and <dtype>.
+
+   Returns:
+   --------
+   block, array : tuple
+      The SharedMemory block and a zeroed NumPy view of it
+   """
+   size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+   block = shared_memory.SharedMemory(create=True, size=size)
+   array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+   array.fill(0)
+   return block, array
+
+def workerLoop(conn, blockNames, shapes, worker, numGames, numPlayers, mapType, mapSize, regenMapOnReset, mapSeeds, gameSeeds):
+   """
+   Runs in each worker process: steps (or resets) games <worker * numGames> to
+   <(worker + 1) * numGames> of the shared arrays whenever told to, then replies DONE.
+   Also replies DONE once the games are ready. <gameSeeds> seeds the random generator of each
+   of its games, so forked workers don't share random state.
+   If a command raises, the worker replies ERROR with the traceback instead and carries on.
+   If setting the games up raises, it replies ERROR and exits.
+   """
+   blocks = []
+   try:
+      env = BatchedHaliteEnv(numGames, numPlayers, mapType, mapSize, regenMapOnReset, mapSeeds, seed=gameSeeds)
+      blocks = [shared_memory.SharedMemory(name=name) for name in blockNames]
+      obs, playerHalite, reward, episodeOver, actions, stepSeconds = [np.ndarray(shape, dtype=dtype, buffer=block.buf) for block, (shape, dtype) in zip(blocks, shapes)]
+   except Exception:
+      conn.send_bytes(ERROR + traceback.format_exc().encode())
+      for block in blocks:
+         block.close()
+      conn.close()
+      return
+   games = slice(worker * numGames, (worker + 1) * numGames)
+   try:
+      command = None
+      while command != CLOSE:
+         try:
+            if(command == STEP):
+               start = time.perf_counter()
+               ob, reward[games], episodeOver[games], info = env.step(actions[games])
+               stepSeconds[worker] = time.perf_counter() - start
+            elif(command == RESET):
+               env.reset()
+               reward[games] = 0
+               episodeOver[games] = False
+            obs[games] = env.maps[:, :, :, :5]
+            playerHalite[games] = env.playerHalite
+            conn.send_bytes(DONE)
+         except Exception:
+            conn.send_bytes(ERROR + traceback.format_exc().encode())
+         command = conn.recv_bytes()
+   except KeyboardInterrupt:
+      pass
+   finally:
+      del obs, playerHalite, reward, episodeOver, actions, stepSeconds
+      for block in blocks:
+         block.close()
+      conn.close()
+
+class SubprocVecHaliteEnv:
+   """
+   Runs Halite III games in <numWorkers> worker processes, each playing <gamesPerWorker> games
+   with a BatchedHaliteEnv. Observations, rewards and actions of every game live in shared memory
+   so nothing but a one byte command goes through the pipes each step.
+
+   Attributes:
+   -----------
+   self.obs : np.ndarray
+      Shared observation of every game, shape (numEnvs, mapSize, mapSize, 5) (layers 0 - 4)
+
+   self.playerHalite : np.ndarray
+      Shared halite of each player in each game, shape (numEnvs, numPlayers)
+
+   self.reward : np.ndarray
+      Shared reward of each player in each game from the last step, shape (numEnvs, numPlayers)
+
+   self.episodeOver : np.ndarray
+      Shared flag of whether each game is over, shape (numEnvs,)
+
+   self.actions : np.ndarray
+      Shared actions of every game, shape (numEnvs, mapSize, mapSize, numPlayers) (int8).
+      step() copies into it, or write to it directly and call step() with no actions.
+
+   self.stepSeconds : np.ndarray
+      Shared time each worker took for its last step
+
+   self.timings : StepTimings
+      Per-phase timing of every step
+
+   self.numEnvs : int
+      Total number of games (numWorkers * gamesPerWorker)
+
+   self.turn : int
+      Number of turns played since the last reset
+   """
+   def __init__(self, numWorkers, numPlayers, mapType, mapSize, regenMapOnReset = False, gamesPerWorker = 1, mapSeeds = None, context = None, seed = None):
+      """
+      SubprocVecHaliteEnv initialization function. Arguments match HaliteEnv, plus the number of
+      workers, the games each worker plays and the multiprocessing context (or start method name)
+      to start the workers with. Seeded maps are dealt out to the workers in turn.
+      <seed> is split into one stream per game (see spawnSeeds), so game i generates the same
+      maps as game i of BatchedHaliteEnv(numEnvs, ..., seed=<seed>), however the games are
+      split between workers.
+      """
+      self.numWorkers = numWorkers
+      self.gamesPerWorker = gamesPerWorker
+      self.numEnvs = numWorkers * gamesPerWorker
+      self.numPlayers = numPlayers
+      self.mapSize = mapSize.value
+      self.metadata = {'render_modes':[], 'map_size':mapSize.value, 'num_players':numPlayers}
+      shapes = [((self.numEnvs, self.mapSize, self.mapSize, 5), np.float64),
+                ((self.numEnvs, numPlayers), np.float64),
+                ((self.numEnvs, numPlayers), np.float64),
+                ((self.numEnvs,), np.bool_),
+                ((self.numEnvs, self.mapSize, self.mapSize, numPlayers), np.int8),
+                ((numWorkers,), np.float64)]
+      self.blocks = []
+      arrays = []
+      for shape, dtype in shapes:
+         block, array = createSharedArray(shape, dtype)
+         self.blocks.append(block)
+         arrays.append(array)
+      self.obs, self.playerHalite, self.reward, self.episodeOver, self.actions, self.stepSeconds = arrays
+      self.turn = 0
+      self.timings = StepTimings()
+      self.waiting = False
+      self.submitted = 0
+
+      if(context is None or isinstance(context, str)):
+         context = mp.get_context(context)
+      self.conns = []
+      self.processes = []
+      gameSeeds = spawnSeeds(seed, self.numEnvs)
+      for worker in range(0, numWorkers):
+         parentConn, childConn = context.Pipe()
+         seeds = None if mapSeeds is None else mapSeeds[worker::numWorkers]
+         process = context.Process(target=workerLoop, daemon=True,
+                                   args=(childConn, [block.name for block in self.blocks], shapes, worker,
+                                         gamesPerWorker, numPlayers, mapType, mapSize, regenMapOnReset, seeds,
+                                         gameSeeds[worker * gamesPerWorker:(worker + 1) * gamesPerWorker]))
+         process.start()
+         childConn.close()
+         self.conns.append(parentConn)
+         self.processes.append(process)
+      self.closed = False
+      #Workers reply once their games are ready
+      try:
+         self.collect()
+      except BaseException:
+         #Stop the workers that did start and free the shared memory
+         self.close()
+         raise
+
+   def collect(self):
+      """
+      Receives every worker's reply to the last command. If any worker failed, raises a
+      RuntimeError holding its traceback, once all replies are read so the pipes stay in step.
+      """
+      errors = []
+      for worker, conn in enumerate(self.conns):
+         reply = conn.recv_bytes()
+         if(reply[:1] == ERROR):
+            errors.append("Worker " + str(worker) + " failed:\n" + reply[1:].decode())
+      if(errors):
+         raise RuntimeError("\n".join(errors))
+
+   def broadcast(self, command):
+      """
+      Sends <command> to every worker, then waits for all of them to finish it.
+      """
+      for conn in self.conns:
+         conn.send_bytes(command)
+      self.collect()
+
+   def stepAsync(self, actions = None):
+      """
+      Starts stepping every game and returns straight away, so the caller can do other work
+      (like inference) while the workers simulate. Don't touch the shared arrays until stepWait().
+
+      Parameters:
+      -----------
+      actions : np.ndarray
+         Actions of shape (numEnvs, mapSize, mapSize, numPlayers) (see HaliteEnv.step).
+         If None, whatever is in self.actions is used.
+      """
+      assert not self.waiting, "stepWait() must be called before stepping again"
+      start = time.perf_counter()
+      if(actions is not None):
+         self.actions[:] = actions
+      for conn in self.conns:
+         conn.send_bytes(STEP)
+      self.waiting = True
+      self.submitted = time.perf_counter()
+      self.timings.add('submit', self.submitted - start)
+
+   def stepWait(self):
+      """
+      Waits for the step started by stepAsync() to finish.
+
+      Returns:
+      --------
+      ob, reward, episode_over, info : tuple
+         ob (tuple):
+            (<obs>, <playerHalite>), views of the shared arrays (copy them to keep them past the next step)
+         reward (array):
+            Reward for each player of each game, shape (numEnvs, numPlayers)
+         episode_over (array):
+            Whether each game is over, shape (numEnvs,)
+         info (dict)
+            The turn just played
+
+      Raises RuntimeError with the worker's traceback if a game failed to step (e.g. stepping
+      past the turn limit without calling reset()).
+      """
+      assert self.waiting, "stepAsync() must be called first"
+      start = time.perf_counter()
+      self.timings.add('overlap', start - self.submitted)
+      try:
+         self.collect()
+      finally:
+         self.waiting = False
+      self.timings.add('wait', time.perf_counter() - start)
+      self.timings.add('simulate', float(self.stepSeconds.max()))
+      self.timings.steps += 1
+      self.turn += 1
+      return ((self.obs, self.playerHalite), self.reward, self.episodeOver, {'turn':self.turn})
+
+   def step(self, actions = None):
+      """
+      Steps every game and waits for them (stepAsync() followed by stepWait()).
+      """
+      self.stepAsync(actions)
+      return self.stepWait()
+
+   async def asyncStep(self, actions = None):
+      """
+      Coroutine version of step(): the event loop keeps running while the workers simulate.
+      The pipes are waited on from a thread, which works with any event loop (Windows'
+      ProactorEventLoop can't watch pipes itself).
+      """
+      self.stepAsync(actions)
+      loop = asyncio.get_running_loop()
+      pending = self.conns
+      try:
+         pending = [conn for conn in self.conns if not conn.poll()]
+         while(pending):
+            ready = await loop.run_in_executor(None, connection.wait, pending)
+            pending = [conn for conn in pending if conn not in ready]
+      finally:
+         if(self.waiting and pending):
+            #Cancelled while the workers step: they still reply, so take the replies now
+            #or the next command would read them
+            self.stepWait()
+      return self.stepWait()
+
+   def reset(self):
+      """
+      Resets every game (see HaliteEnv.reset).
+      """
+      assert not self.waiting, "stepWait() must be called before resetting"
+      self.broadcast(RESET)
+      self.turn = 0
+      return (self.obs, self.playerHalite)
+
+   def close(self):
+      """
+      Stops the workers and frees the shared memory.
+      """
+      if(self.closed):
+         return
+      self.closed = True
+      for conn in self.conns:
+         try:
+            conn.send_bytes(CLOSE)
+         except (BrokenPipeError, OSError):
+            pass
+      for process in self.processes:
+         process.join(timeout=5)
+         if(process.is_alive()):
+            process.terminate()
+      for conn in self.conns:
+         conn.close()
+      del self.obs, self.playerHalite, self.reward, self.episodeOver, self.actions, self.stepSeconds
+      for block in self.blocks:
+         block.close()
+         block.unlink()
+
+   def __del__(self):
+      if(hasattr(self, 'closed')):
+         self.close()
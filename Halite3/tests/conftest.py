@@ -0,0 +1,5 @@
+import os
+import sys
+
+#Tests import haliteenv from the folder it's in, wherever pytest is run from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
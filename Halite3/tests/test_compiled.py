@@ -0,0 +1,63 @@
+"""
+Differential tests of the engines: the compiled turn (haliteenv.compiled.playTurn, run as plain
+Python when Numba isn't installed) and the batched kernels must play exactly the same games as
+HaliteEngine's NumPy kernels. Games start with ships placed at random (see
+benchmark.placeFleet), so collisions, Dropoffs and inspiration come up from the first turn.
+"""
+import numpy as np
+import pytest
+from haliteenv.batched import BatchedHaliteEnv
+from haliteenv.benchmark import placeFleet
+from haliteenv.compiled import playTurn
+from haliteenv.engine import HaliteEngine, MapType, MapSize, spawnSeeds
+
+#Few Dropoffs, so that the ships and halite build up
+ACTION_CHANCES = [0.1, 0.3, 0.01, 0.15, 0.15, 0.15, 0.14]
+NUM_TURNS = 60
+NUM_SHIPS = 60
+
+def randomActions(random, shape):
+   return random.choice(7, shape, p=ACTION_CHANCES)
+
+@pytest.mark.parametrize('mapSize', [MapSize.TINY, MapSize.MEDIUM])
+@pytest.mark.parametrize('numPlayers', [2, 4])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_compiledMatchesNumPy(mapSize, numPlayers, seed):
+   random = np.random.default_rng(seed)
+   envs = [HaliteEngine(numPlayers, MapType.BASIC, mapSize, mapSeeds=[seed]) for engine in range(0, 2)]
+   #Runs the loops even without Numba
+   envs[1].turnKernel = playTurn
+   placeFleet(envs[0], NUM_SHIPS, random)
+   envs[1].setState(envs[0].getState())
+   for turn in range(0, NUM_TURNS):
+      action = randomActions(random, (envs[0].mapSize, envs[0].mapSize, numPlayers))
+      (referenceMap, referenceHalite), referenceReward, referenceOver, info = envs[0].step(action)
+      (map, playerHalite), reward, episodeOver, info = envs[1].step(action)
+      assert np.array_equal(envs[0].map, envs[1].map), "map differs on turn " + str(turn)
+      assert np.array_equal(referenceHalite, playerHalite), "playerHalite differs on turn " + str(turn)
+      assert np.array_equal(referenceReward, reward), "reward differs on turn " + str(turn)
+      assert np.array_equal(envs[0].dropoffDistance, envs[1].dropoffDistance), "dropoffDistance differs on turn " + str(turn)
+      assert referenceOver == episodeOver
+
+@pytest.mark.parametrize('mapSize', [MapSize.TINY, MapSize.MEDIUM])
+@pytest.mark.parametrize('numPlayers', [2, 4])
+@pytest.mark.parametrize('seed', [0, 1])
+def test_batchedMatchesSingle(mapSize, numPlayers, seed):
+   numGames = 3
+   random = np.random.default_rng(seed)
+   batch = BatchedHaliteEnv(numGames, numPlayers, MapType.BASIC, mapSize, seed=seed)
+   #Game i of a batch seeded with <seed> is the game seeded with stream i of <seed>
+   envs = [HaliteEngine(numPlayers, MapType.BASIC, mapSize, seed=gameSeed) for gameSeed in spawnSeeds(seed, numGames)]
+   for game, env in enumerate(envs):
+      assert np.array_equal(batch.maps[game], env.map)
+      placeFleet(env, NUM_SHIPS, random)
+      batch.maps[game] = env.map
+   for turn in range(0, NUM_TURNS):
+      actions = randomActions(random, (numGames, batch.mapSize, batch.mapSize, numPlayers))
+      (maps, playerHalite), reward, episodeOver, info = batch.step(actions)
+      for game, env in enumerate(envs):
+         (map, halite), gameReward, gameOver, gameInfo = env.step(actions[game])
+         assert np.array_equal(env.map, batch.maps[game]), "map of game " + str(game) + " differs on turn " + str(turn)
+         assert np.array_equal(halite[:, 0], playerHalite[game]), "playerHalite of game " + str(game) + " differs on turn " + str(turn)
+         assert np.allclose(gameReward, reward[game]), "reward of game " + str(game) + " differs on turn " + str(turn)
+         assert gameOver == episodeOver[game]
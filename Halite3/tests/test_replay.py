@@ -0,0 +1,74 @@
+"""
+Round trip tests of the replay format: a game is recorded with HaliteEngine.startReplay and every
+turn is read back with ReplayReader, from a closed file and from one whose writer never closed it.
+"""
+import shutil
+import numpy as np
+import pytest
+from haliteenv.benchmark import placeFleet
+from haliteenv.engine import HaliteEngine, MapType, MapSize
+from haliteenv.replay import ReplayReader
+
+NUM_TURNS = 60
+KEYFRAME_INTERVAL = 7
+
+@pytest.fixture(scope='module')
+def recordedGame(tmp_path_factory):
+   """
+   Records a game, returning the path of the closed replay, of a copy taken before the writer
+   closed it, and the observation, actions and reward of every turn.
+   """
+   directory = tmp_path_factory.mktemp('replays')
+   path = str(directory / 'game.hlr')
+   unclosedPath = str(directory / 'unclosed.hlr')
+   random = np.random.default_rng(0)
+   env = HaliteEngine(2, MapType.BASIC, MapSize.TINY, mapSeeds=[0])
+   placeFleet(env, 60, random)
+   env.startReplay(path, keyframeInterval=KEYFRAME_INTERVAL)
+   observations, actions, rewards = [env.materialize()], [None], [None]
+   for turn in range(0, NUM_TURNS):
+      action = random.integers(0, 7, (env.mapSize, env.mapSize, env.numPlayers))
+      ob, reward, episodeOver, info = env.step(action)
+      observations.append(env.materialize())
+      actions.append(action)
+      rewards.append(reward.copy())
+   env.replay.file.flush()
+   shutil.copy(path, unclosedPath)
+   env.stopReplay()
+   return path, unclosedPath, observations, actions, rewards
+
+@pytest.mark.parametrize('closed', [True, False])
+def test_observationInAnyOrder(recordedGame, closed):
+   path, unclosedPath, observations, actions, rewards = recordedGame
+   order = np.random.default_rng(1).permutation(len(observations))
+   with ReplayReader(path if closed else unclosedPath) as reader:
+      assert len(reader) == len(observations)
+      for turn in list(order) + list(range(0, len(observations))):
+         map, playerHalite = reader.observation(turn)
+         assert np.array_equal(map, observations[turn][0]), "map differs on turn " + str(turn)
+         assert np.array_equal(playerHalite, observations[turn][1]), "playerHalite differs on turn " + str(turn)
+
+@pytest.mark.parametrize('closed', [True, False])
+def test_actionsAndRewards(recordedGame, closed):
+   path, unclosedPath, observations, actions, rewards = recordedGame
+   with ReplayReader(path if closed else unclosedPath) as reader:
+      assert not reader.denseActions(0).any()
+      for turn in range(1, len(reader)):
+         assert np.array_equal(reader.denseActions(turn), actions[turn]), "actions differ on turn " + str(turn)
+         player, cell, command = reader.actions(turn)
+         assert np.array_equal(actions[turn].reshape(-1, reader.numPlayers)[cell, player], command)
+         assert np.array_equal(reader.reward(turn), rewards[turn]), "reward differs on turn " + str(turn)
+
+def test_unclosedFileWithPartialRecord(recordedGame, tmp_path):
+   path, unclosedPath, observations, actions, rewards = recordedGame
+   #A writer killed while writing the last record leaves only part of it
+   truncatedPath = str(tmp_path / 'truncated.hlr')
+   with open(unclosedPath, 'rb') as source, open(truncatedPath, 'wb') as target:
+      data = source.read()
+      target.write(data[:len(data) - 12])
+   with ReplayReader(truncatedPath) as reader:
+      assert len(reader) == len(observations) - 1
+      turn = len(reader) - 1
+      map, playerHalite = reader.observation(turn)
+      assert np.array_equal(map, observations[turn][0])
+      assert np.array_equal(playerHalite, observations[turn][1])